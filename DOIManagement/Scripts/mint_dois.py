@@ -1,50 +1,67 @@
 #!/usr/bin/env python
-import json
 import sys
-import requests
+import orjson
+import msgspec
 import argparse
-from datetime import datetime
+from datetime import date
+from typing import Any, List
+from concurrent.futures import ThreadPoolExecutor
 
-def create_datacite_doi(rocrate_path, prefix, username, password, repository_id, api_url='https://api.test.datacite.org/dois'):
+class ROCrateNode(msgspec.Struct):
+    # Only the properties read below are decoded; everything else is skipped
+    id: Any = msgspec.field(name='@id', default='')
+    type: Any = msgspec.field(name='@type', default=())
+    name: Any = 'Untitled Dataset'
+    description: Any = ''
+    keywords: Any = msgspec.field(default_factory=list)
+    version: Any = '1.0'
+    url: Any = ''
+    contentUrl: Any = ''
+    author: Any = None
+    license: Any = None
+    datePublished: Any = None
+
+class ROCrate(msgspec.Struct):
+    graph: List[ROCrateNode] = msgspec.field(name='@graph', default_factory=list)
+
+ROCRATE_DECODER = msgspec.json.Decoder(ROCrate)
+
+def normalize_authors(raw):
+    # Map the author property onto DataCite creators
+    match raw:
+        case list():
+            authors = [{"name": author} if isinstance(author, str) else {"name": author.get('name', 'Unknown')}
+                       for author in raw]
+        case dict():
+            authors = [{"name": raw.get('name', 'Unknown')}]
+        case None:
+            authors = []
+        case _:
+            authors = [{"name": raw}]
+    return authors or [{"name": "Unknown"}]
+
+def create_datacite_doi(rocrate_path, prefix, username, password, repository_id, api_url='https://api.test.datacite.org/dois', session=None):
     # Load the RO-Crate metadata
-    with open(rocrate_path, 'r') as f:
-        rocrate = json.load(f)
+    with open(rocrate_path, 'rb') as f:
+        rocrate = ROCRATE_DECODER.decode(f.read())
     
     # Extract dataset from the graph
-    dataset = None
-    for item in rocrate.get('@graph', []):
-        if '@type' in item and ('Dataset' in item['@type'] or 'https://w3id.org/EVI#ROCrate' in item['@type']):
-            dataset = item
-            break
+    # First node in graph order; a string @type matches by substring (e.g. EVI#Dataset)
+    dataset = next((node for node in rocrate.graph
+                    if 'Dataset' in node.type or 'https://w3id.org/EVI#ROCrate' in node.type), None)
     
     if not dataset:
-        print("Error: No dataset found in RO-Crate metadata")
-        sys.exit(1)
+        raise ValueError("No dataset found in RO-Crate metadata")
 
     # Extract the relevant metadata for DataCite
-    dataset_id = dataset.get('@id', '')
-    title = dataset.get('name', 'Untitled Dataset')
-    description = dataset.get('description', '')
-    keywords = dataset.get('keywords', [])
-    version = dataset.get('version', '1.0')
-    url = dataset.get('url', '')
-    content_url = dataset.get('contentUrl', '')
-    authors = []
-    
-    # Handle authors
-    if 'author' in dataset:
-        if isinstance(dataset['author'], list):
-            for author in dataset['author']:
-                if isinstance(author, str):
-                    authors.append({"name": author})
-                else:
-                    name = author.get('name', 'Unknown')
-                    authors.append({"name": name})
-        else:
-            authors.append({"name": dataset['author']})
-    
-    if not authors:
-        authors = [{"name": "Unknown"}]
+    dataset_id = dataset.id
+    title = dataset.name
+    description = dataset.description
+    keywords = dataset.keywords
+    version = dataset.version
+    url = dataset.url
+    content_url = dataset.contentUrl
+    authors = normalize_authors(dataset.author)
 
     # Format DataCite metadata according to their schema
     datacite_metadata = {
@@ -56,7 +73,7 @@ def create_datacite_doi(rocrate_path, prefix, username, password, repository_id,
                 "creators": authors,
                 "titles": [{"title": title}],
                 "publisher": "Your Institution Name",
-                "publicationYear": datetime.now().year,
+                "publicationYear": date.today().year,
                 "types": {
                     "resourceTypeGeneral": "Dataset"
                 },
@@ -91,16 +108,16 @@ def create_datacite_doi(rocrate_path, prefix, username, password, repository_id,
         }
     
     # Determine if we have a license
-    if 'license' in dataset:
+    if dataset.license is not None:
         datacite_metadata['data']['attributes']['rightsList'] = [
-            {"rights": dataset['license']}
+            {"rights": dataset.license}
         ]
 
     # Add publication date if available
-    if 'datePublished' in dataset:
+    if dataset.datePublished is not None:
         datacite_metadata['data']['attributes']['dates'] = [
             {
-                "date": dataset['datePublished'].split('T')[0],
+                "date": dataset.datePublished.split('T')[0],
                 "dateType": "Issued"
             }
         ]
@@ -108,10 +125,12 @@ def create_datacite_doi(rocrate_path, prefix, username, password, repository_id,
     # Submit to DataCite API
     datacite_url = api_url
     
-    response = requests.post(
+    # requests is imported here so `--help` and argument errors never load it
+    import requests
+    response = (session or requests).post(
         datacite_url,
-        json=datacite_metadata,
-        auth=requests.auth.HTTPBasicAuth(username, password),
+        data=orjson.dumps(datacite_metadata),
+        auth=(username, password),
         headers={
             "Content-Type": "application/vnd.api+json",
             "Accept": "application/vnd.api+json"
@@ -119,18 +138,34 @@ def create_datacite_doi(rocrate_path, prefix, username, password, repository_id,
     )
     
     if response.status_code in (200, 201):
-        doi_response = response.json()
+        doi_response = orjson.loads(response.content)
         new_doi = doi_response['data']['id']
         print(f"https://doi.org/{new_doi}")
         return new_doi
     else:
-        print(f"Error creating DOI. Status code: {response.status_code}")
-        print(f"Response: {response.text}")
-        sys.exit(1)
+        raise ValueError(f"Error creating DOI. Status code: {response.status_code}\nResponse: {response.text}")
+
+def create_datacite_dois_batch(rocrate_paths, prefix, username, password, repository_id, api_url='https://api.test.datacite.org/dois', max_workers=8):
+    # Mint DOIs concurrently over one session so the batch reuses keep-alive
+    # connections. A failure is reported for its own crate only, so DOIs minted on
+    # other threads are never lost; the result holds the new DOI or None for each
+    # path, in input order
+    import requests
+    
+    with requests.Session() as session:
+        def mint(rocrate_path):
+            try:
+                return create_datacite_doi(rocrate_path, prefix, username, password, repository_id, api_url, session=session)
+            except Exception as e:
+                print(f"Error minting DOI for {rocrate_path}: {e}", file=sys.stderr)
+                return None
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(mint, rocrate_paths))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Create a DOI on DataCite from RO-Crate metadata')
-    parser.add_argument('rocrate_path', help='Path to ro-crate-metadata.json file')
+    parser.add_argument('rocrate_paths', nargs='+', help='Path(s) to ro-crate-metadata.json file(s)')
     parser.add_argument('--prefix', required=True, help='Your DataCite prefix (e.g., 10.XXXX)')
     parser.add_argument('--username', required=True, help='DataCite API username')
     parser.add_argument('--password', required=True, help='DataCite API password')
@@ -139,11 +174,14 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    create_datacite_doi(
-        args.rocrate_path, 
+    dois = create_datacite_dois_batch(
+        args.rocrate_paths, 
         args.prefix, 
         args.username, 
         args.password, 
         args.repository,
         args.api_url
-    )
\ No newline at end of file
+    )
+    
+    if None in dois:
+        sys.exit(1)
\ No newline at end of file
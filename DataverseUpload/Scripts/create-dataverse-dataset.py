@@ -1,23 +1,113 @@
 import argparse
-import json
-import requests
-import csv
+import orjson
+import msgspec
 from pathlib import Path
 import sys
-from datetime import datetime
+import re
+from datetime import date
+from collections import defaultdict
+from typing import Any, List
+
+LICENSE_MAP = {
+    "https://creativecommons.org/licenses/by/4.0": {
+        "name": "CC BY 4.0",
+        "uri": "https://creativecommons.org/licenses/by/4.0"
+    },
+    "https://creativecommons.org/licenses/by-nc-sa/4.0": {
+        "name": "CC BY-NC-SA 4.0",
+        "uri": "https://creativecommons.org/licenses/by-nc-sa/4.0"
+    },
+    "https://creativecommons.org/publicdomain/zero/1.0": {
+        "name": "CC0 1.0",
+        "uri": "http://creativecommons.org/publicdomain/zero/1.0"
+    }
+}
+DEFAULT_LICENSE = LICENSE_MAP["https://creativecommons.org/licenses/by/4.0"]
+
+PRIMITIVE = "primitive"
+COMPOUND = "compound"
+CONTROLLED = "controlledVocabulary"
+
+def _field(type_name, value, type_class=PRIMITIVE, multiple=False):
+    # One Dataverse citation field, keys in the order Dataverse exports them
+    return {"value": value, "typeClass": type_class, "multiple": multiple, "typeName": type_name}
+
+# Static citation field shared by every dataset; never mutated
+SUBJECT_FIELD = _field("subject", ["Computer and Information Science"], CONTROLLED, True)
+
+_ISO_DATE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})')
+_MDY_DATE = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})$')
+
+def normalize_publish_date(publish_date):
+    # Format date to ensure YYYY-MM-DD, falling back to today's date
+    if publish_date:
+        if _ISO_DATE.match(publish_date):
+            # Already in YYYY-MM-DD format (possibly with a time part)
+            return publish_date[:10]
+        m = _MDY_DATE.match(publish_date)
+        if m:
+            # Handle MM/DD/YYYY format
+            return f"{m[3]}-{m[1].zfill(2)}-{m[2].zfill(2)}"
+    return date.today().isoformat()
+
+class ROCrateNode(msgspec.Struct):
+    # Only the properties read below are decoded; everything else is skipped
+    id: Any = msgspec.field(name='@id', default=None)
+    type: Any = msgspec.field(name='@type', default=())
+    name: Any = "Untitled Dataset"
+    description: Any = ""
+    author: Any = ''
+    keywords: Any = msgspec.field(default_factory=list)
+    license: Any = "https://creativecommons.org/licenses/by/4.0"
+    principalInvestigator: Any = ""
+    contactEmail: Any = ""
+    datePublished: Any = ""
+
+class ROCrate(msgspec.Struct):
+    graph: List[ROCrateNode] = msgspec.field(name='@graph', default_factory=list)
+
+ROCRATE_DECODER = msgspec.json.Decoder(ROCrate)
+
+def normalize_authors(raw):
+    # Author names from a list or a semicolon-separated string
+    match raw:
+        case list():
+            return raw
+        case str():
+            return [author.strip() for author in raw.split(';') if author.strip()] or [raw]
+        case _:
+            return []
+
+def index_graph(graph):
+    # Index nodes by each of their @type values in one pass
+    by_type = defaultdict(list)
+    for node in graph:
+        node_type = node.type
+        for t in (node_type if isinstance(node_type, list) else (node_type,)):
+            by_type[t].append(node)
+    return by_type
 
 def load_authors_info(authors_csv_path):
     authors_info = {}
     if authors_csv_path:
+        import csv
         try:
-            with open(authors_csv_path, 'r') as f:
-                reader = csv.DictReader(f)
+            with open(authors_csv_path, 'r', newline='') as f:
+                reader = csv.reader(f)
+                # Resolve column positions once from the header
+                idx = {h: i for i, h in enumerate(next(reader, []))}
+                name_i, affiliation_i, orcid_i = (idx.get(c, -1) for c in ('name', 'affiliation', 'orcid'))
+                
+                def col(row, i):
+                    # Missing columns and short rows read as empty strings
+                    return row[i] if 0 <= i < len(row) else ''
+                
                 for row in reader:
-                    name = row.get('name', '').strip()
+                    name = col(row, name_i).strip()
                     if name:
                         authors_info[name] = {
-                            'affiliation': row.get('affiliation', ''),
-                            'orcid': row.get('orcid', '')
+                            'affiliation': col(row, affiliation_i),
+                            'orcid': col(row, orcid_i)
                         }
         except Exception as e:
             print(f"Warning: Error loading authors CSV: {e}")
@@ -29,129 +119,55 @@ def create_dataverse_dataset(token, dataverse_url, dataverse_collection, rocrate
     
     # Read RO-Crate metadata
     try:
-        with open(rocrate_path, 'r') as f:
-            rocrate_data = json.load(f)
+        with open(rocrate_path, 'rb') as f:
+            rocrate_data = ROCRATE_DECODER.decode(f.read())
     except Exception as e:
         print(f"Error reading RO-Crate metadata: {e}")
         sys.exit(1)
     
     # Find the root node (dataset)
-    root_node = None
-    for item in rocrate_data.get('@graph', []):
-        # Skip the metadata descriptor node
-        if item.get('@id') == 'ro-crate-metadata.json':
-            continue
-        
-        # The root node is typically the main dataset node
-        if item.get('@type') and ('Dataset' in item.get('@type') or 
-                                 (isinstance(item.get('@type'), list) and 'Dataset' in item.get('@type'))):
-            root_node = item
-            break
+    by_type = index_graph(rocrate_data.graph)
+    # Skip the metadata descriptor node; the root node is typically the main dataset node
+    root_node = next((item for item in by_type.get('Dataset', []) if item.id != 'ro-crate-metadata.json'), None)
     
     if not root_node:
         print("Error: Could not find root dataset node in RO-Crate")
         sys.exit(1)
     
     # Transform metadata to Dataverse format
-    license_map = {
-        "https://creativecommons.org/licenses/by/4.0": {
-            "name": "CC BY 4.0",
-            "uri": "https://creativecommons.org/licenses/by/4.0"
-        },
-        "https://creativecommons.org/licenses/by-nc-sa/4.0": {
-            "name": "CC BY-NC-SA 4.0",
-            "uri": "https://creativecommons.org/licenses/by-nc-sa/4.0"
-        },
-        "https://creativecommons.org/publicdomain/zero/1.0": {
-            "name": "CC0 1.0",
-            "uri": "http://creativecommons.org/publicdomain/zero/1.0"
-        }
-    }
-    
     # Get license info or default to CC BY 4.0
-    license_url = root_node.get('license', "https://creativecommons.org/licenses/by/4.0")
-    license_info = license_map.get(license_url, license_map["https://creativecommons.org/licenses/by/4.0"])
+    license_url = root_node.license
+    license_info = LICENSE_MAP.get(license_url, DEFAULT_LICENSE)
     
     # Extract authors
-    authors = root_node.get('author', '')
     author_entries = []
     
-    if isinstance(authors, list):
-        author_list = authors
-    elif isinstance(authors, str):
-        author_list = [author.strip() for author in authors.split(';') if author.strip()]
-        if not author_list:
-            author_list = [authors]
-    else:
-        author_list = []
-    
-    for author in author_list:
+    for author in normalize_authors(root_node.author):
         author_name = author.strip()
         author_info = authors_info.get(author_name, {})
         
         author_entry = {
-            "authorName": {
-                "value": author_name,
-                "typeClass": "primitive",
-                "multiple": False,
-                "typeName": "authorName"
-            },
-            "authorAffiliation": {
-                "value": author_info.get('affiliation', ''),
-                "typeClass": "primitive",
-                "multiple": False,
-                "typeName": "authorAffiliation"
-            }
+            "authorName": _field("authorName", author_name),
+            "authorAffiliation": _field("authorAffiliation", author_info.get('affiliation', ''))
         }
         
         if author_info.get('orcid'):
-            author_entry["authorIdentifierScheme"] = {
-                "value": "ORCID",
-                "typeClass": "controlledVocabulary",
-                "multiple": False,
-                "typeName": "authorIdentifierScheme"
-            }
-            author_entry["authorIdentifier"] = {
-                "value": author_info.get('orcid'),
-                "typeClass": "primitive",
-                "multiple": False,
-                "typeName": "authorIdentifier"
-            }
+            author_entry["authorIdentifierScheme"] = _field("authorIdentifierScheme", "ORCID", CONTROLLED)
+            author_entry["authorIdentifier"] = _field("authorIdentifier", author_info.get('orcid'))
         
         author_entries.append(author_entry)
     
     # Extract keywords
-    keywords = root_node.get('keywords', [])
+    keywords = root_node.keywords
     if isinstance(keywords, str):
         keywords = [keywords]
     
     # Add required dataset contact info
-    contact_name = root_node.get("principalInvestigator", "")
-    contact_email = root_node.get("contactEmail", "")
+    contact_name = root_node.principalInvestigator
+    contact_email = root_node.contactEmail
     
     # Get publication date or use today's date
-    publish_date = root_node.get("datePublished", "")
-    if not publish_date:
-        publish_date = datetime.today().strftime("%Y-%m-%d")
-    
-    # Format date to ensure YYYY-MM-DD
-    try:
-        if '/' in publish_date:
-            # Handle MM/DD/YYYY format
-            date_parts = publish_date.split('/')
-            if len(date_parts) == 3:
-                publish_date = f"{date_parts[2]}-{date_parts[0].zfill(2)}-{date_parts[1].zfill(2)}"
-        elif len(publish_date) == 10 and publish_date[4] == '-' and publish_date[7] == '-':
-            # Already in YYYY-MM-DD format
-            pass
-        else:
-            # Try to parse the date
-            date_obj = datetime.strptime(publish_date, "%m/%d/%Y")
-            publish_date = date_obj.strftime("%Y-%m-%d")
-    except (ValueError, IndexError):
-        # Fall back to today's date if parsing fails
-        publish_date = datetime.today().strftime("%Y-%m-%d")
-    
+    publish_date = normalize_publish_date(root_node.datePublished)
     
     dataverse_metadata = {
         "datasetVersion": {
@@ -159,78 +175,24 @@ def create_dataverse_dataset(token, dataverse_url, dataverse_collection, rocrate
             "metadataBlocks": {
                 "citation": {
                     "fields": [
-                        {
-                            "value": root_node.get("name", "Untitled Dataset"),
-                            "typeClass": "primitive",
-                            "multiple": False,
-                            "typeName": "title"
-                        },
-                        {
-                            "value": author_entries,
-                            "typeClass": "compound",
-                            "multiple": True,
-                            "typeName": "author"
-                        },
-                        {
-                            "value": [
-                                {
-                                    "datasetContactName": {"value": contact_name, "typeClass": "primitive", 
-                                                         "multiple": False, "typeName": "datasetContactName"},
-                                    "datasetContactEmail": {"value": contact_email, "typeClass": "primitive", 
-                                                          "multiple": False, "typeName": "datasetContactEmail"}
-                                }
-                            ],
-                            "typeClass": "compound",
-                            "multiple": True,
-                            "typeName": "datasetContact"
-                        },
-                        {
-                            "value": [
-                                {
-                                    "dsDescriptionValue": {"value": root_node.get("description", ""), 
-                                                        "typeClass": "primitive", "multiple": False, 
-                                                        "typeName": "dsDescriptionValue"}
-                                }
-                            ],
-                            "typeClass": "compound",
-                            "multiple": True,
-                            "typeName": "dsDescription"
-                        },
-                        {
-                            "value": ["Computer and Information Science"],
-                            "typeClass": "controlledVocabulary",
-                            "multiple": True,
-                            "typeName": "subject"
-                        },
-                        {
-                            "value": [
-                                {
-                                    "keywordValue": {"value": keyword, "typeClass": "primitive", 
-                                                   "multiple": False, "typeName": "keywordValue"}
-                                } for keyword in keywords
-                            ],
-                            "typeClass": "compound",
-                            "multiple": True,
-                            "typeName": "keyword"
-                        },
-                        {
-                            "value": publish_date,
-                            "typeClass": "primitive",
-                            "multiple": False,
-                            "typeName": "datasetPublicationDate"
-                        },
-                        {
-                            "value": publish_date,
-                            "typeClass": "primitive",
-                            "multiple": False,
-                            "typeName": "distributionDate"
-                        },
-                        {
-                            "value": publish_date,
-                            "typeClass": "primitive",
-                            "multiple": False,
-                            "typeName": "productionDate"
-                        }
+                        _field("title", root_node.name),
+                        _field("author", author_entries, COMPOUND, True),
+                        _field("datasetContact", [
+                            {
+                                "datasetContactName": _field("datasetContactName", contact_name),
+                                "datasetContactEmail": _field("datasetContactEmail", contact_email)
+                            }
+                        ], COMPOUND, True),
+                        _field("dsDescription", [
+                            {"dsDescriptionValue": _field("dsDescriptionValue", root_node.description)}
+                        ], COMPOUND, True),
+                        SUBJECT_FIELD,
+                        _field("keyword", [
+                            {"keywordValue": _field("keywordValue", keyword)} for keyword in keywords
+                        ], COMPOUND, True),
+                        _field("datasetPublicationDate", publish_date),
+                        _field("distributionDate", publish_date),
+                        _field("productionDate", publish_date)
                     ]
                 }
             }
@@ -246,11 +208,14 @@ def create_dataverse_dataset(token, dataverse_url, dataverse_collection, rocrate
         "Content-Type": "application/json"
     }
     
+    # requests is imported here so `--help` and argument errors never load it
+    import requests
+    
     try:
-        response = requests.post(url, headers=headers, json=dataverse_metadata)
+        response = requests.post(url, headers=headers, data=orjson.dumps(dataverse_metadata))
         
         if response.status_code == 201:
-            result = response.json()
+            result = orjson.loads(response.content)
             print(result['data']['persistentId'])
             return result['data']['persistentId']
         else:
@@ -1,11 +1,12 @@
 import argparse
-import requests
 import sys
 import os
 import json
+import orjson
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-def upload_file_to_dataverse(token, dataverse_url, dataset_id, file_path, description=None):
+def upload_file_to_dataverse(token, dataverse_url, dataset_id, file_path, description=None, session=None):
     # Check if file exists
     file_path = Path(file_path)
     if not file_path.exists():
@@ -27,10 +28,6 @@ def upload_file_to_dataverse(token, dataverse_url, dataset_id, file_path, descri
     # Get directory path for directoryLabel
     directory_label = os.path.dirname(str(file_path))
     
-    # Prepare file for upload
-    with open(file_path, 'rb') as f:
-        file_content = f.read()
-    
     # Create JSON data with only description and directoryLabel
     json_data = {
         'directoryLabel': directory_label
@@ -39,18 +36,33 @@ def upload_file_to_dataverse(token, dataverse_url, dataset_id, file_path, descri
     if description:
         json_data['description'] = description
     
-    # Set up multipart form data
-    files = {
-        'file': (file_path.name, file_content, 'application/octet-stream'),
-        'jsonData': (None, json.dumps(json_data))
-    }
-    
     try:
-        # Upload the file
-        response = requests.post(url, headers=headers, files=files)
+        # requests is imported here so `--help` and argument errors never load it
+        import requests
+        post = (session or requests).post
+        try:
+            from requests_toolbelt import MultipartEncoder
+        except ImportError:
+            MultipartEncoder = None
+        
+        with open(file_path, 'rb') as f:
+            if MultipartEncoder is not None:
+                # Stream the multipart body so the file is never read into memory
+                encoder = MultipartEncoder(fields={
+                    'file': (file_path.name, f, 'application/octet-stream'),
+                    'jsonData': json.dumps(json_data)
+                })
+                response = post(url, headers={**headers, 'Content-Type': encoder.content_type}, data=encoder)
+            else:
+                # Without requests_toolbelt, requests builds the multipart body in memory
+                files = {
+                    'file': (file_path.name, f, 'application/octet-stream'),
+                    'jsonData': (None, json.dumps(json_data))
+                }
+                response = post(url, headers=headers, files=files)
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             file_id = result['data']['files'][0]['dataFile']['id']
             
             # Construct the download URL
@@ -70,21 +82,31 @@ def upload_file_to_dataverse(token, dataverse_url, dataset_id, file_path, descri
     except Exception:
         return None
 
-def upload_multiple_files(token, dataverse_url, dataset_id, file_paths, descriptions=None):
-    download_urls = []
+def upload_multiple_files(token, dataverse_url, dataset_id, file_paths, descriptions=None, max_workers=1):
+    # Get description for each file if available
+    descriptions = descriptions or []
+    file_descriptions = [descriptions[i] if i < len(descriptions) else None for i in range(len(file_paths))]
     
-    # Upload each file
-    for i, file_path in enumerate(file_paths):
-        # Get description for this file if available
-        description = None
-        if descriptions and i < len(descriptions):
-            description = descriptions[i]
-        
-        # Upload the file
-        download_url = upload_file_to_dataverse(token, dataverse_url, dataset_id, file_path, description)
+    # Dataverse locks the dataset while it adds and ingests each file, so uploads
+    # run one at a time unless the caller opts into more workers
+    import requests
+    
+    with requests.Session() as session:
+        def upload(args):
+            return upload_file_to_dataverse(token, dataverse_url, dataset_id, *args, session=session)
         
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(upload, zip(file_paths, file_descriptions)))
+        else:
+            results = [upload(args) for args in zip(file_paths, file_descriptions)]
+    
+    download_urls = []
+    for file_path, download_url in zip(file_paths, results):
         if download_url:
             download_urls.append(download_url)
+        else:
+            print(f"Failed to upload {file_path}", file=sys.stderr)
     
     return download_urls
 
@@ -98,10 +120,12 @@ def main():
                       help='Path to file for upload (can be specified multiple times)')
     parser.add_argument('--description', action='append',
                       help='Optional description for the file (can be specified multiple times)')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Number of concurrent uploads (default: 1, Dataverse locks the dataset per upload)')
     
     args = parser.parse_args()
     
-    upload_multiple_files(args.token, args.url, args.dataset, args.file, args.description)
+    upload_multiple_files(args.token, args.url, args.dataset, args.file, args.description, max_workers=args.workers)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
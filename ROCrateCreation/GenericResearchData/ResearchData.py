@@ -1,13 +1,25 @@
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Union, Any
-import json
 import pathlib
+from dataclasses import dataclass
 from datetime import datetime
-import os
 
-from fairscape_cli.models.rocrate import GenerateROCrate, AppendCrate
-from fairscape_cli.models.dataset import GenerateDataset
-from fairscape_cli.models.software import GenerateSoftware
+from ROCrateCreation.crate_writer import CrateWriter
+from ROCrateCreation.GenericResearchData.connectors._common import file_extension
+
+@dataclass(slots=True)
+class FileRecord:
+    """
+    Metadata for a single data file collected from a repository.
+    """
+    id: Any = None
+    name: str = "Unnamed file"
+    size: int = 0
+    format: str = ""
+    description: Optional[str] = None
+    download_url: str = ""
+    url: Optional[str] = None
+    uploaded_date: Optional[str] = None
 
 class ResearchData(BaseModel):
     """
@@ -22,7 +34,7 @@ class ResearchData(BaseModel):
     keywords: List[str] = []
     publication_date: Optional[str] = None
     doi: Optional[str] = None
-    files: List[Dict[str, Any]] = []
+    files: List[FileRecord] = []
     software: List[Dict[str, Any]] = []
     metadata: Dict[str, Any] = {}
     
@@ -36,8 +48,14 @@ class ResearchData(BaseModel):
         Returns:
             GUID of the created RO-Crate
         """
+        # fairscape_cli is imported on first use so fetch-only callers never load it
+        from fairscape_cli.models.rocrate import GenerateROCrate
+        from fairscape_cli.models.software import GenerateSoftware
+        
         output_path = pathlib.Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
+        now_iso = datetime.now().isoformat()
+        date_published = self.publication_date or now_iso
 
         rocrate_data = GenerateROCrate(
             path=output_path,
@@ -48,7 +66,7 @@ class ResearchData(BaseModel):
             license=self.license or "https://creativecommons.org/licenses/by/4.0/",
             hasPart=[],
             author=self.authors,
-            datePublished=self.publication_date or datetime.now().isoformat(),
+            datePublished=date_published,
             associatedPublication=self.doi or "",
             isPartOf=[],
             version="1.0"
@@ -56,39 +74,17 @@ class ResearchData(BaseModel):
         
 
         generated_guids = []
+        # Collected and appended in one pass so the metadata file is rewritten once
+        crate_objs = []
         
         for file_info in self.files:
+            if file_info.description == "":
+                file_info.description = self.description
             
-            file_format = file_info.get("format", "")
-            if not file_format and "name" in file_info:   
-                ext = os.path.splitext(file_info["name"])[1].lstrip(".")
-                file_format = ext or "unknown"
-            if file_info.get("description") == "":
-                file_info["description"] = self.description
-                
-            dataset = GenerateDataset(
-                guid=None,
-                url=file_info.get("url"),
-                author=self.authors,
-                name=file_info.get("name", "Unnamed file"),
-                description=file_info.get("description", f"File from {self.repository_name}"),
-                keywords=self.keywords,
-                datePublished=file_info.get("uploaded_date", self.publication_date or datetime.now().isoformat()),
-                version="1.0",
-                associatedPublication=self.doi or None,
-                additionalDocumentation=None,
-                format=file_format,
-                schema="",
-                derivedFrom=[],
-                usedBy=[],
-                generatedBy=[],
-                filepath=None,
-                contentUrl=file_info.get("download_url", ""),
-                cratePath=output_path
-            )
+            dataset = self._build_dataset(file_info, output_path, date_published, url=file_info.url)
             
             generated_guids.append(dataset.guid)
-            AppendCrate(pathlib.Path(output_path), [dataset])
+            crate_objs.append(dataset)
             
         for software_info in self.software:
             software_version = software_info.get("version", "0.1.0")
@@ -97,7 +93,7 @@ class ResearchData(BaseModel):
                 guid=None,
                 name=software_info.get("name", "Unnamed software"),
                 author=self.authors[0] if self.authors else "Unknown",
-                dateModified=software_info.get("date_modified", datetime.now().isoformat()),
+                dateModified=software_info.get("date_modified", now_iso),
                 version=software_version,
                 description=software_info.get("description", f"Software from {self.repository_name}"),
                 associatedPublication=self.doi or None,
@@ -108,14 +104,58 @@ class ResearchData(BaseModel):
             )
             
             generated_guids.append(software.guid)
-            AppendCrate(pathlib.Path(output_path), [software])
+            crate_objs.append(software)
         
-        metadata_path = output_path / "ro-crate-metadata.json"
-        with open(metadata_path, 'r') as f:
-            crate_data = json.load(f)
-            root_id = crate_data["@graph"][1]["@id"]
+        with CrateWriter(output_path) as crate:
+            crate.extend(crate_objs)
         
-        return root_id
+        # GenerateROCrate returns the root dataset it wrote, so no re-read is needed
+        return rocrate_data["@id"]
+    
+    def _build_dataset(self, file_info: FileRecord, crate_path: pathlib.Path,
+                       date_published: str, url: Optional[str] = None):
+        """
+        Build the RO-Crate dataset entry for one file record.
+        
+        Args:
+            file_info: File metadata record from a connector
+            crate_path: Directory of the RO-Crate the dataset belongs to
+            date_published: Fallback publication date for the file
+            url: Optional landing page URL for the file
+            
+        Returns:
+            Dataset model ready to append to the crate
+        """
+        from fairscape_cli.models.dataset import GenerateDataset
+        
+        file_format = file_info.format or file_extension(file_info.name).lstrip(".") or "unknown"
+        description = file_info.description
+        if description is None:
+            description = f"File from {self.repository_name}"
+        uploaded_date = file_info.uploaded_date
+        if uploaded_date is None:
+            uploaded_date = date_published
+        
+        return GenerateDataset(
+            guid=None,
+            url=url,
+            author=self.authors,
+            name=file_info.name,
+            description=description,
+            keywords=self.keywords,
+            datePublished=uploaded_date,
+            version="1.0",
+            associatedPublication=self.doi or None,
+            additionalDocumentation=None,
+            format=file_format,
+            schema="",
+            derivedFrom=[],
+            usedBy=[],
+            generatedBy=[],
+            filepath=None,
+            contentUrl=file_info.download_url,
+            cratePath=crate_path
+        )
     
     @classmethod
     def from_repository(cls, repository_type: str, identifier: str, **kwargs) -> 'ResearchData':
@@ -154,54 +194,17 @@ class ResearchData(BaseModel):
         Returns:
             GUID of the updated RO-Crate
         """
-        from fairscape_cli.models.rocrate import AppendCrate
-        from fairscape_cli.models.dataset import GenerateDataset
-        
         rocrate_path = pathlib.Path(rocrate_path)
         metadata_path = rocrate_path / "ro-crate-metadata.json"
         
         if not metadata_path.exists():
             raise ValueError(f"No RO-Crate metadata found at {rocrate_path}")
         
-        # Create datasets for each file
-        dataset_objs = []
-        
-        for file_info in self.files:
-            file_format = file_info.get("format", "")
-            if not file_format and "name" in file_info:
-                ext = os.path.splitext(file_info["name"])[1].lstrip(".")
-                file_format = ext or "unknown"
-            print("HELLO")
-            print(file_info.get("description", f"File from {self.repository_name}"))
-            print("HI")
-            dataset = GenerateDataset(
-                guid=None,
-                url=None,
-                author=self.authors,
-                name=file_info.get("name", "Unnamed file"),
-                description=file_info.get("description", f"File from {self.repository_name}"),
-                keywords=self.keywords,
-                datePublished=file_info.get("uploaded_date", self.publication_date or datetime.now().isoformat()),
-                version="1.0",
-                associatedPublication=self.doi or None,
-                additionalDocumentation=None,
-                format=file_format,
-                schema="",
-                derivedFrom=[],
-                usedBy=[],
-                generatedBy=[],
-                filepath=None,
-                contentUrl=file_info.get("download_url", ""),
-                cratePath=rocrate_path
-            )
-            
-            dataset_objs.append(dataset)
-        
-        AppendCrate(rocrate_path, dataset_objs)
+        # Create datasets for each file; the crate is read and written once
+        date_published = self.publication_date or datetime.now().isoformat()
         
-        # Read the metadata file to get the root id
-        with open(metadata_path, 'r') as f:
-            crate_data = json.load(f)
-            root_id = crate_data["@graph"][1]["@id"]
+        with CrateWriter(metadata_path) as crate:
+            for file_info in self.files:
+                crate.add(self._build_dataset(file_info, rocrate_path, date_published))
         
-        return root_id
\ No newline at end of file
+        return crate.root_id
\ No newline at end of file
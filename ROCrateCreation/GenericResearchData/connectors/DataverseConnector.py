@@ -1,9 +1,95 @@
-import requests
-import os
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from ROCrateCreation.GenericResearchData.ResearchData import ResearchData
+from ROCrateCreation.GenericResearchData.ResearchData import ResearchData, FileRecord
+from ROCrateCreation.GenericResearchData.connectors._common import SOFTWARE_EXTENSIONS, file_extension as file_extension_of
+from ROCrateCreation.GenericResearchData.connectors._http import get_session
+
+def _auth_headers(api_token: Optional[str]) -> Dict[str, str]:
+    return {"X-Dataverse-key": api_token} if api_token else {}
+
+def _persistent_id(doi: str) -> str:
+    # Handle DOI format
+    if doi.startswith("10."):
+        return f"doi:{doi}"
+    return doi
+
+def _parse_response(content: bytes, default: Any) -> Any:
+    data = orjson.loads(content)
+    if "status" in data and data["status"] == "ERROR":
+        raise ValueError(f"API error: {data.get('message', 'Unknown error')}")
+    
+    return data.get("data", default)
+
+# Raw dataset metadata and file listing bodies are cached per process, keyed on
+# the server URL, the token and the identifier; failed requests raise and are not
+# cached. The immutable bytes are parsed on every call, so callers always get
+# their own dicts and lists and cannot change what later fetches see
+@lru_cache(maxsize=256)
+def _fetch_dataset_content(server_url: str, api_token: Optional[str], doi: str) -> bytes:
+    persistent_id = _persistent_id(doi)
+    
+    url = f"{server_url}/api/datasets/:persistentId/"
+    params = {"persistentId": persistent_id}
+    
+    response = get_session().get(url, params=params, headers=_auth_headers(api_token))
+    
+    if response.status_code != 200:
+        raise ValueError(f"Failed to fetch dataset {doi}: {response.text}")
+    
+    return response.content
+
+@lru_cache(maxsize=256)
+def _fetch_files_content(server_url: str, api_token: Optional[str], dataset_id: str) -> bytes:
+    url = f"{server_url}/api/datasets/{dataset_id}/versions/:latest/files"
+    response = get_session().get(url, headers=_auth_headers(api_token))
+    
+    if response.status_code != 200:
+        raise ValueError(f"Failed to fetch files for dataset {dataset_id}: {response.text}")
+    
+    return response.content
+
+@lru_cache(maxsize=256)
+def _fetch_files_by_pid_content(server_url: str, api_token: Optional[str], doi: str) -> bytes:
+    url = f"{server_url}/api/datasets/:persistentId/versions/:latest/files"
+    params = {"persistentId": _persistent_id(doi)}
+    response = get_session().get(url, params=params, headers=_auth_headers(api_token))
+    
+    if response.status_code != 200:
+        raise ValueError(f"Failed to fetch files for dataset {doi}: {response.text}")
+    
+    return response.content
+
+def _parse_title(field: Dict[str, Any], citation: Dict[str, Any]) -> None:
+    citation["title"] = field.get("value", "")
+
+def _parse_description(field: Dict[str, Any], citation: Dict[str, Any]) -> None:
+    descriptions = field.get("value", [])
+    if descriptions:
+        citation["description"] = descriptions[0].get("dsDescriptionValue", {}).get("value", "")
+
+def _parse_authors(field: Dict[str, Any], citation: Dict[str, Any]) -> None:
+    citation["authors"] += [author_name for author in field.get("value", [])
+                            if (author_name := author.get("authorName", {}).get("value", ""))]
+
+def _parse_keywords(field: Dict[str, Any], citation: Dict[str, Any]) -> None:
+    citation["keywords"] += [keyword_value for keyword in field.get("value", [])
+                             if (keyword_value := keyword.get("keywordValue", {}).get("value", ""))]
+
+def _parse_publication_date(field: Dict[str, Any], citation: Dict[str, Any]) -> None:
+    citation["publication_date"] = field.get("value", "")
+
+# Citation block fields read by fetch_data, keyed by Dataverse typeName
+_CITATION_HANDLERS = {
+    "title": _parse_title,
+    "dsDescription": _parse_description,
+    "author": _parse_authors,
+    "keyword": _parse_keywords,
+    "distributionDate": _parse_publication_date,
+}
 
 class DataverseConnector:
     """
@@ -20,9 +106,8 @@ class DataverseConnector:
         """
         self.server_url = server_url.rstrip("/")
         self.api_token = api_token
-        self.headers = {}
-        if api_token:
-            self.headers["X-Dataverse-key"] = api_token
+        self.headers = _auth_headers(api_token)
+        self.session = get_session()
     
     def fetch_dataset(self, doi: str) -> Dict[str, Any]:
         """
@@ -34,26 +119,7 @@ class DataverseConnector:
         Returns:
             Dictionary containing dataset metadata
         """
-        # Handle DOI format
-        persistent_id = doi
-        if doi.startswith("doi:"):
-            persistent_id = doi
-        elif doi.startswith("10."):
-            persistent_id = f"doi:{doi}"
-        
-        url = f"{self.server_url}/api/datasets/:persistentId/"
-        params = {"persistentId": persistent_id}
-        
-        response = requests.get(url, params=params, headers=self.headers)
-        
-        if response.status_code != 200:
-            raise ValueError(f"Failed to fetch dataset {doi}: {response.text}")
-        
-        data = response.json()
-        if "status" in data and data["status"] == "ERROR":
-            raise ValueError(f"API error: {data.get('message', 'Unknown error')}")
-        
-        return data.get("data", {})
+        return _parse_response(_fetch_dataset_content(self.server_url, self.api_token, doi), {})
     
     def fetch_files(self, dataset_id: str) -> List[Dict[str, Any]]:
         """
@@ -65,17 +131,20 @@ class DataverseConnector:
         Returns:
             List of dictionaries containing file metadata
         """
-        url = f"{self.server_url}/api/datasets/{dataset_id}/versions/:latest/files"
-        response = requests.get(url, headers=self.headers)
-        
-        if response.status_code != 200:
-            raise ValueError(f"Failed to fetch files for dataset {dataset_id}: {response.text}")
-        
-        data = response.json()
-        if "status" in data and data["status"] == "ERROR":
-            raise ValueError(f"API error: {data.get('message', 'Unknown error')}")
+        return _parse_response(_fetch_files_content(self.server_url, self.api_token, dataset_id), [])
+    
+    def fetch_files_by_pid(self, doi: str) -> List[Dict[str, Any]]:
+        """
+        Fetch files associated with a Dataverse dataset by its persistent ID,
+        without first resolving the numeric dataset ID.
         
-        return data.get("data", [])
+        Args:
+            doi: Dataset DOI or persistent ID
+            
+        Returns:
+            List of dictionaries containing file metadata
+        """
+        return _parse_response(_fetch_files_by_pid_content(self.server_url, self.api_token, doi), [])
     
     def fetch_data(self, doi: str, include_files: bool = True) -> ResearchData:
         """
@@ -88,64 +157,46 @@ class DataverseConnector:
         Returns:
             ResearchData object populated with Dataverse data
         """
-        dataset = self.fetch_dataset(doi)
+        # Fetch the dataset and its file listing concurrently; both are addressed by persistent ID
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            dataset_future = executor.submit(self.fetch_dataset, doi)
+            files_future = executor.submit(self.fetch_files_by_pid, doi) if include_files else None
+            dataset = dataset_future.result()
+            file_metadata = files_future.result() if files_future else []
         
         # Extract metadata
         metadata = dataset.get("latestVersion", {}).get("metadataBlocks", {})
         citation_metadata = metadata.get("citation", {}).get("fields", [])
         
         # Parse citation metadata
-        title = ""
-        description = ""
-        authors = []
-        keywords = []
-        publication_date = ""
+        citation = {"title": "", "description": "", "authors": [], "keywords": [], "publication_date": ""}
+        handlers_get = _CITATION_HANDLERS.get
         
         for field in citation_metadata:
-            field_name = field.get("typeName", "")
-            
-            if field_name == "title":
-                title = field.get("value", "")
-            
-            elif field_name == "dsDescription":
-                descriptions = field.get("value", [])
-                if descriptions:
-                    description = descriptions[0].get("dsDescriptionValue", {}).get("value", "")
-            
-            elif field_name == "author":
-                for author in field.get("value", []):
-                    author_name = author.get("authorName", {}).get("value", "")
-                    if author_name:
-                        authors.append(author_name)
-            
-            elif field_name == "keyword":
-                for keyword in field.get("value", []):
-                    keyword_value = keyword.get("keywordValue", {}).get("value", "")
-                    if keyword_value:
-                        keywords.append(keyword_value)
-            
-            elif field_name == "distributionDate":
-                publication_date = field.get("value", "")
+            handler = handlers_get(field.get("typeName", ""))
+            if handler:
+                handler(field, citation)
+        
+        title = citation["title"]
+        description = citation["description"]
+        authors = citation["authors"]
+        keywords = citation["keywords"]
+        publication_date = citation["publication_date"]
         
         # Get files if requested
         files = []
         software = []
         
         if include_files:
-            dataset_id = dataset.get("id")
-            if dataset_id:
-                file_metadata = self.fetch_files(dataset_id)
+            if dataset.get("id"):
                 dataset_url = f"{self.server_url}/dataset.xhtml?persistentId={doi}"
                 
                 for file_data in file_metadata:
                     data_file = file_data.get("dataFile", {})
                     file_name = data_file.get("filename", "")
-                    file_extension = os.path.splitext(file_name)[1].lower() if file_name else ""
+                    file_extension = file_extension_of(file_name).lower()
+                    is_software = file_extension in SOFTWARE_EXTENSIONS
                     
-
-                    software_extensions = ['.py', '.r', '.sh', '.exe', '.java', '.cpp', '.js', '.jsx', '.css']
-                    is_software = file_extension.lower() in software_extensions
-                                        
                     file_id = data_file.get("id")
                     download_url = f"{self.server_url}/api/access/datafile/{file_id}"
                     
@@ -162,18 +213,18 @@ class DataverseConnector:
                             "documentation_url": dataset_url
                         })
                     else:
-                        files.append({
-                            "id": file_id,
-                            "name": file_name,
-                            "size": data_file.get("filesize", 0),
-                            "format": file_extension.lstrip(".") or "",
-                            "description": data_file.get("description", ""),
-                            "download_url": download_url,
-                            "url": dataset_url,
-                            "uploaded_date": data_file.get("creationDate", "")
-                        })
+                        files.append(FileRecord(
+                            id=file_id,
+                            name=file_name,
+                            size=data_file.get("filesize", 0),
+                            format=file_extension.lstrip(".") or "",
+                            description=data_file.get("description", ""),
+                            download_url=download_url,
+                            url=dataset_url,
+                            uploaded_date=data_file.get("creationDate", "")
+                        ))
         
-        # Create and return ResearchData instance
+        # Create and return ResearchData instance, validating the remote-derived fields
         return ResearchData(
             repository_name="Dataverse",
             project_id=doi,
@@ -211,12 +262,12 @@ class DataverseConnector:
             "per_page": limit
         }
         
-        response = requests.get(url, params=params, headers=self.headers)
+        response = self.session.get(url, params=params, headers=self.headers)
         
         if response.status_code != 200:
             raise ValueError(f"Failed to search datasets: {response.text}")
         
-        data = response.json()
+        data = orjson.loads(response.content)
         if "status" in data and data["status"] == "ERROR":
             raise ValueError(f"API error: {data.get('message', 'Unknown error')}")
         
@@ -1,9 +1,38 @@
-import requests
-import os
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
-from datetime import datetime
 
-from ..ResearchData import ResearchData
+from ..ResearchData import ResearchData, FileRecord
+from ._common import SOFTWARE_EXTENSIONS, file_extension as file_extension_of
+from ._http import get_session
+
+def _auth_headers(token: Optional[str]) -> Dict[str, str]:
+    return {"Authorization": f"token {token}"} if token else {}
+
+# Raw article metadata and file listing bodies are cached per process, keyed on
+# the API base URL, the token and the article id; failed requests raise and are
+# not cached. The immutable bytes are parsed on every call, so callers always get
+# their own dicts and lists and cannot change what later fetches see
+@lru_cache(maxsize=256)
+def _fetch_article_content(base_url: str, token: Optional[str], article_id: str) -> bytes:
+    url = f"{base_url}/articles/{article_id}"
+    response = get_session().get(url, headers=_auth_headers(token))
+    
+    if response.status_code != 200:
+        raise ValueError(f"Failed to fetch article {article_id}: {response.text}")
+    
+    return response.content
+
+@lru_cache(maxsize=256)
+def _fetch_files_content(base_url: str, token: Optional[str], article_id: str) -> bytes:
+    url = f"{base_url}/articles/{article_id}/files"
+    response = get_session().get(url, headers=_auth_headers(token))
+    
+    if response.status_code != 200:
+        raise ValueError(f"Failed to fetch files for article {article_id}: {response.text}")
+    
+    return response.content
 
 class FigshareConnector:
     """
@@ -20,9 +49,8 @@ class FigshareConnector:
             token: Optional API token for accessing private datasets
         """
         self.token = token
-        self.headers = {}
-        if token:
-            self.headers["Authorization"] = f"token {token}"
+        self.headers = _auth_headers(token)
+        self.session = get_session()
     
     def fetch_article(self, article_id: str) -> Dict[str, Any]:
         """
@@ -34,13 +62,7 @@ class FigshareConnector:
         Returns:
             Dictionary containing article metadata
         """
-        url = f"{self.BASE_URL}/articles/{article_id}"
-        response = requests.get(url, headers=self.headers)
-        
-        if response.status_code != 200:
-            raise ValueError(f"Failed to fetch article {article_id}: {response.text}")
-        
-        return response.json()
+        return orjson.loads(_fetch_article_content(self.BASE_URL, self.token, article_id))
     
     def fetch_files(self, article_id: str) -> List[Dict[str, Any]]:
         """
@@ -52,13 +74,7 @@ class FigshareConnector:
         Returns:
             List of dictionaries containing file metadata
         """
-        url = f"{self.BASE_URL}/articles/{article_id}/files"
-        response = requests.get(url, headers=self.headers)
-        
-        if response.status_code != 200:
-            raise ValueError(f"Failed to fetch files for article {article_id}: {response.text}")
-        
-        return response.json()
+        return orjson.loads(_fetch_files_content(self.BASE_URL, self.token, article_id))
     
     def fetch_data(self, article_id: str, include_files: bool = True) -> ResearchData:
         """
@@ -71,28 +87,25 @@ class FigshareConnector:
         Returns:
             ResearchData object populated with Figshare data
         """
-        article = self.fetch_article(article_id)
+        # Fetch the article and its file listing concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            article_future = executor.submit(self.fetch_article, article_id)
+            files_future = executor.submit(self.fetch_files, article_id) if include_files else None
+            article = article_future.result()
+            raw_files = files_future.result() if files_future else []
         
         # Extract authors
-        authors = []
-        for author in article.get("authors", []):
-            author_name = author.get("full_name", "")
-            if author_name:
-                authors.append(author_name)
+        authors = [author_name for author in article.get("authors", [])
+                   if (author_name := author.get("full_name", ""))]
         
         # Extract keywords from tags
         keywords = article.get("tags", [])
         
         # Format publication date
         pub_date = article.get("published_date")
-        if pub_date:
-            try:
-                # Try to convert to ISO format if needed
-                dt = datetime.strptime(pub_date, "%Y-%m-%dT%H:%M:%SZ")
-                pub_date = dt.isoformat()
-            except ValueError:
-                # Already in ISO format or unknown format
-                pass
+        if pub_date and len(pub_date) == 20 and pub_date[10] == "T" and pub_date.endswith("Z"):
+            # "YYYY-MM-DDTHH:MM:SSZ" -> naive ISO format; other formats pass through
+            pub_date = pub_date[:-1]
         
         # Get the figshare landing page URL
         figshare_url = article.get("url", "")
@@ -101,15 +114,11 @@ class FigshareConnector:
         files = []
         software = []
         if include_files:
-            raw_files = self.fetch_files(article_id)
-            
             for file_data in raw_files:
                 file_name = file_data.get("name", "")
-                file_extension = os.path.splitext(file_name)[1].lower() if file_name else ""
-
-                software_extensions = ['.py', '.r', '.sh', '.exe', '.java', '.cpp', '.js', '.jsx', '.css']
-                is_software = file_extension.lower() in software_extensions
-                            
+                file_extension = file_extension_of(file_name).lower()
+                is_software = file_extension in SOFTWARE_EXTENSIONS
+                
                 if is_software:
                     software.append({
                         "id": file_data.get("id"),
@@ -123,18 +132,18 @@ class FigshareConnector:
                         "documentation_url": figshare_url
                     })
                 else:
-                    files.append({
-                        "id": file_data.get("id"),
-                        "name": file_name,
-                        "size": file_data.get("size", 0),
-                        "format": file_extension.lstrip(".") or "",
-                        "description": file_data.get("description", ""),
-                        "download_url": file_data.get("download_url", ""),
-                        "url": figshare_url,  # Add landing page URL
-                        "uploaded_date": file_data.get("uploaded_date", pub_date)
-                    })
-        
-        # Create and return ResearchData instance
+                    files.append(FileRecord(
+                        id=file_data.get("id"),
+                        name=file_name,
+                        size=file_data.get("size", 0),
+                        format=file_extension.lstrip(".") or "",
+                        description=file_data.get("description", ""),
+                        download_url=file_data.get("download_url", ""),
+                        url=figshare_url,  # Add landing page URL
+                        uploaded_date=file_data.get("uploaded_date", pub_date)
+                    ))
+        
+        # Create and return ResearchData instance, validating the remote-derived fields
         return ResearchData(
             repository_name="Figshare",
             project_id=article_id,
@@ -174,9 +183,9 @@ class FigshareConnector:
             "limit": limit
         }
         
-        response = requests.post(url, json=params, headers=self.headers)
+        response = self.session.post(url, json=params, headers=self.headers)
         
         if response.status_code != 200:
             raise ValueError(f"Failed to search articles: {response.text}")
         
-        return response.json()
\ No newline at end of file
+        return orjson.loads(response.content)
\ No newline at end of file
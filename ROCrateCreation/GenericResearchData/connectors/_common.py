@@ -0,0 +1,11 @@
+# File extensions that connectors classify as software rather than data
+SOFTWARE_EXTENSIONS = frozenset({'.py', '.r', '.sh', '.exe', '.java', '.cpp', '.js', '.jsx', '.css'})
+
+def file_extension(file_name: str) -> str:
+    """
+    Return the extension of a file name including the dot, as os.path.splitext
+    would, using string partitioning instead of full path parsing.
+    """
+    base = file_name.rpartition('/')[2].lstrip('.')
+    _, dot, ext = base.rpartition('.')
+    return dot + ext if dot else ""
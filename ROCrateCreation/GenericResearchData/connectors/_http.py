@@ -0,0 +1,16 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Process-wide session shared by every connector instance, retrying transient
+# gateway errors with a short backoff; the last response is still returned so the
+# connectors' status checks raise their usual ValueError with the response body
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+
+def get_session() -> requests.Session:
+    return _session
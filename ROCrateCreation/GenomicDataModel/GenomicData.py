@@ -1,11 +1,20 @@
 from pydantic import BaseModel
-import json
 import pathlib
+import re
+import sys
+import time
 from datetime import datetime
-import os
 import csv
+from collections import defaultdict
+from itertools import chain
+from operator import itemgetter
 import yaml
-import pathlib
+
+# Prefer the libyaml-backed dumper/loader when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
 
 from ROCrateCreation.GenomicDataModel.project import Project
 from ROCrateCreation.GenomicDataModel.sample import Samples, Sample
@@ -13,13 +22,123 @@ from ROCrateCreation.GenomicDataModel.experiment import Experiments, Experiment
 from ROCrateCreation.GenomicDataModel.output import Outputs, Output, OutputFile
 from ROCrateCreation.GenomicDataModel.cell_line_api import get_cell_line_entity
 from ROCrateCreation.GenomicDataModel.bioproject_fetcher import fetch_bioproject_data
+from ROCrateCreation.crate_writer import CrateWriter, iter_graph, read_json, write_json
 
-from fairscape_cli.models.rocrate import GenerateROCrate, AppendCrate
+from fairscape_cli.models.rocrate import GenerateROCrate
 from fairscape_cli.models.dataset import GenerateDataset
 from fairscape_cli.models.experiment import GenerateExperiment
 from fairscape_cli.models.instrument import GenerateInstrument
 from fairscape_cli.models.sample import GenerateSample
 
+# Sample tables can run to tens of MB; a 1 MiB buffer keeps the number of write calls low
+CSV_BUFFER_SIZE = 1 << 20
+
+# Data type keywords are added to the crate with every "e" removed
+_DROP_E = str.maketrans('', '', 'e')
+
+# Cached NCBI BioProject results are refetched after a week
+BIOPROJECT_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Columns every PEP sample/subsample row has; attribute and file_N columns are added per project
+SAMPLE_BASE_FIELDS = (
+    "sample_name", "protocol", "organism", "sample_title", "sample_accession",
+    "sample_status", "sample_submission_date", "sample_last_update_date", "sample_type",
+    "sample_channel_count", "sample_source_name_ch1", "sample_organism_ch1",
+    "sample_taxid_ch1", "sample_contact_institute", "sample_series_id", "gsm_id",
+    "sex", "tissue", "celltype", "treatment", "biosample"
+)
+STUDY_FIELDS = (
+    "study_accession", "study_title", "study_center_name", "study_abstract", "study_description"
+)
+SUBSAMPLE_BASE_FIELDS = (
+    "sample_name", "subsample_name", "srr", "srx", "total_spots", "total_bases", "size",
+    "published", "nreads", "nspots", "a_count", "c_count", "g_count", "t_count", "n_count",
+    "read_type", "data_source", "library_name", "library_strategy", "library_source",
+    "library_selection", "library_layout", "nominal_length", "instrument_model",
+    "platform_type", "experiment_title"
+)
+
+# Model fields exported as PropertyValues on RO-Crate samples and experiments, in output order
+SAMPLE_PROPERTY_FIELDS = ("accession", "scientific_name", "taxon_id")
+EXPERIMENT_PROPERTY_FIELDS = (
+    "accession", "library_name", "library_strategy", "library_source",
+    "library_selection", "library_layout", "nominal_length"
+)
+
+# Sample columns/properties read into dedicated fields rather than attributes
+PEP_SAMPLE_SKIP_KEYS = frozenset({
+    'sample_name', 'sample_accession', 'scientific_name', 'taxon_id',
+    'title', 'accession', 'study_accession', 'study_title',
+    'study_center_name', 'study_abstract', 'study_description'
+})
+ROCRATE_SAMPLE_SKIP_KEYS = frozenset({
+    '@id', '@type', 'accession', 'title', 'scientific_name', 'taxon_id',
+    'name', 'description', 'keywords', 'author', 'format', 'version'
+})
+
+# Sample fields read verbatim from the PEP sample table, named as the columns
+PEP_STUDY_FIELDS = ('study_accession', 'study_center_name', 'study_title', 'study_abstract', 'study_description')
+# Run fields read verbatim from the PEP subsample table, as (field, column)
+PEP_OUTPUT_COLUMNS = (
+    ('accession', 'srr'), ('title', 'subsample_name'), ('total_spots', 'total_spots'),
+    ('total_bases', 'total_bases'), ('size', 'size'), ('published', 'published'),
+    ('nreads', 'nreads'), ('nspots', 'nspots'), ('a_count', 'a_count'), ('c_count', 'c_count'),
+    ('g_count', 'g_count'), ('t_count', 't_count'), ('n_count', 'n_count')
+)
+
+# Computation and software keywords recognized as library and platform values in RO-Crates
+LIBRARY_STRATEGY_KEYWORDS = frozenset({'RNA-Seq', 'WGS', 'ChIP-Seq', 'Bisulfite-Seq'})
+LIBRARY_SOURCE_KEYWORDS = frozenset({'GENOMIC', 'TRANSCRIPTOMIC', 'METAGENOMIC'})
+LIBRARY_SELECTION_KEYWORDS = frozenset({'PCR', 'RANDOM', 'Hybrid Selection'})
+LIBRARY_LAYOUT_KEYWORDS = frozenset({'PAIRED', 'SINGLE'})
+PLATFORM_KEYWORDS = frozenset({'ILLUMINA', 'PACBIO', 'NANOPORE', 'OXFORD'})
+
+# Crate keywords naming the project organism
+_SPECIES_SEARCH = re.compile(r'sapiens|elegans').search
+
+# Free-text PEP attribute values at least this long are unlikely to repeat and are not interned
+INTERN_MAX_LENGTH = 64
+
+
+def _intern(value):
+    """Intern strings that repeat across records (organisms, platforms, attribute names) so they are stored once."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _ref_ids(value):
+    """Return the @ids of an RO-Crate reference property given as an id, an {"@id": ...} object, or a list of either."""
+    if value is None:
+        return ()
+    if isinstance(value, list):
+        return [item.get('@id') if isinstance(item, dict) else item for item in value]
+    return (value.get('@id') if isinstance(value, dict) else value,)
+
+
+def _read_pep_table(path):
+    """
+    Read a PEP sample table as (columns, missing, rows) without building a dict per row.
+    
+    columns maps each header name to its index. Rows are lists padded the way
+    csv.DictReader pads short rows (None) and trimmed to the header width, plus
+    one trailing '' cell at index missing that lookups of absent columns use.
+    """
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row.extend([None] * (width - len(row)))
+            elif len(row) > width:
+                del row[width:]
+            row.append('')
+            rows.append(row)
+    return {name: i for i, name in enumerate(header)}, width, rows
+
+
 class GenomicData(BaseModel):
     project: Project
     samples: Samples
@@ -43,6 +162,12 @@ class GenomicData(BaseModel):
         output_path.mkdir(parents=True, exist_ok=True)
         
         project = self.project
+        accession = project.accession
+        submitted_date = project.submitted_date
+        organization_name = project.organization_name
+        release_date = project.release_date
+        release_date_short = release_date.split("T", 1)[0] if "T" in release_date else release_date
+        sample_status = f"Public on {release_date_short}"
         
         project_config = {
             "name": project.accession.lower(),
@@ -52,7 +177,7 @@ class GenomicData(BaseModel):
             "experiment_metadata": {
                 "series_contact_institute": project.organization_name,
                 "series_bioproject_accession": project.accession,
-                "series_last_update_date": project.release_date.split("T")[0] if "T" in project.release_date else project.release_date,
+                "series_last_update_date": release_date_short,
                 "series_overall_design": project.description,
                 "series_platform_organism": project.organism_name,
                 "series_platform_taxid": project.organism_taxID,
@@ -70,128 +195,146 @@ class GenomicData(BaseModel):
         
         config_path = output_path / "project_config.yaml"
         with open(config_path, 'w') as f:
-            yaml.dump(project_config, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(project_config, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
         
         # Map experiments to samples and outputs
-        sample_to_experiment_map = {}
+        sample_to_experiment_map = defaultdict(list)
         for experiment in self.experiments.items:
-            if experiment.sample_ref not in sample_to_experiment_map:
-                sample_to_experiment_map[experiment.sample_ref] = []
             sample_to_experiment_map[experiment.sample_ref].append(experiment)
         
-        experiment_to_output_map = {}
+        experiment_to_output_map = defaultdict(list)
         for output in self.outputs.items:
-            if output.experiment_ref not in experiment_to_output_map:
-                experiment_to_output_map[output.experiment_ref] = []
             experiment_to_output_map[output.experiment_ref].append(output)
         
 
-        samples_data = []        
+        # First pass: collect the CSV columns without building any rows
+        sample_fieldnames = set()
+        has_study = False
+        has_subsamples = False
+        max_files = 0
         for sample in self.samples.items:
-            sex = sample.attributes.get("sex", "")
-            cell_type = sample.attributes.get("cell_type", "")
-            tissue_type = sample.attributes.get("tissue_type", "")
-            
-            row = {
-                "sample_name": sample.accession.lower().replace("-", "_"),
-                "protocol": "", 
-                "organism": sample.scientific_name,
-                "sample_title": sample.title or f"{sample.scientific_name} {sample.accession}",
-                "sample_accession": sample.accession,
-                "sample_status": f"Public on {project.release_date.split('T')[0] if 'T' in project.release_date else project.release_date}",
-                "sample_submission_date": project.submitted_date,
-                "sample_last_update_date": project.release_date.split("T")[0] if "T" in project.release_date else project.release_date,
-                "sample_type": "SRA",
-                "sample_channel_count": "1",
-                "sample_source_name_ch1": tissue_type or cell_type or sample.scientific_name,
-                "sample_organism_ch1": sample.scientific_name,
-                "sample_taxid_ch1": sample.taxon_id,
-                "sample_contact_institute": project.organization_name,
-                "sample_series_id": project.accession,
-                "gsm_id": sample.accession,
-                "sex": sex,
-                "tissue": tissue_type,
-                "celltype": cell_type,
-                "treatment": "",  
-                "biosample": f"https://www.ncbi.nlm.nih.gov/biosample/{sample.accession}"
-            }
-            
+            sample_fieldnames.update(sample.attributes)
             if sample.study_accession:
-                row["study_accession"] = sample.study_accession
-                row["study_title"] = sample.study_title or ""
-                row["study_center_name"] = sample.study_center_name or ""
-                row["study_abstract"] = sample.study_abstract or ""
-                row["study_description"] = sample.study_description or ""
-            
-            experiments = sample_to_experiment_map.get(sample.accession, [])
-            if experiments:
-                first_exp = experiments[0]
-                row["protocol"] = first_exp.library_strategy
-            
-            for key, value in sample.attributes.items():
-                if key not in row:
-                    row[key] = value
-            
-            samples_data.append(row)
-        
-        subsamples_data = []
+                has_study = True
+            for experiment in sample_to_experiment_map.get(sample.accession, []):
+                for output in experiment_to_output_map.get(experiment.accession, []):
+                    has_subsamples = True
+                    if len(output.files) > max_files:
+                        max_files = len(output.files)
+        
+        # Second pass: rows are generated lazily and streamed to the CSV writers
+        def sample_rows():
+            get_experiments = sample_to_experiment_map.get
+            for sample in self.samples.items:
+                sample_accession = sample.accession
+                scientific_name = sample.scientific_name
+                attributes = sample.attributes
+                get_attribute = attributes.get
+                sex = get_attribute("sex", "")
+                cell_type = get_attribute("cell_type", "")
+                tissue_type = get_attribute("tissue_type", "")
+                
+                row = {
+                    "sample_name": sample_accession.lower().replace("-", "_"),
+                    "protocol": "", 
+                    "organism": scientific_name,
+                    "sample_title": sample.title or f"{scientific_name} {sample_accession}",
+                    "sample_accession": sample_accession,
+                    "sample_status": sample_status,
+                    "sample_submission_date": submitted_date,
+                    "sample_last_update_date": release_date_short,
+                    "sample_type": "SRA",
+                    "sample_channel_count": "1",
+                    "sample_source_name_ch1": tissue_type or cell_type or scientific_name,
+                    "sample_organism_ch1": scientific_name,
+                    "sample_taxid_ch1": sample.taxon_id,
+                    "sample_contact_institute": organization_name,
+                    "sample_series_id": accession,
+                    "gsm_id": sample_accession,
+                    "sex": sex,
+                    "tissue": tissue_type,
+                    "celltype": cell_type,
+                    "treatment": "",  
+                    "biosample": f"https://www.ncbi.nlm.nih.gov/biosample/{sample_accession}"
+                }
+                
+                if sample.study_accession:
+                    row["study_accession"] = sample.study_accession
+                    row["study_title"] = sample.study_title or ""
+                    row["study_center_name"] = sample.study_center_name or ""
+                    row["study_abstract"] = sample.study_abstract or ""
+                    row["study_description"] = sample.study_description or ""
+                
+                experiments = get_experiments(sample_accession)
+                if experiments:
+                    first_exp = experiments[0]
+                    row["protocol"] = first_exp.library_strategy
+                
+                for key, value in attributes.items():
+                    if key not in row:
+                        row[key] = value
+                
+                yield row
         
-        for sample in self.samples.items:
-            sample_name = sample.accession.lower().replace("-", "_")
-            
-            experiments = sample_to_experiment_map.get(sample.accession, [])
-            
-            for experiment in experiments:
-                outputs = experiment_to_output_map.get(experiment.accession, [])
+        def subsample_rows():
+            get_experiments = sample_to_experiment_map.get
+            get_outputs = experiment_to_output_map.get
+            for sample in self.samples.items:
+                sample_name = sample.accession.lower().replace("-", "_")
+                
+                experiments = get_experiments(sample.accession, ())
                 
-                for output in outputs:
-                    subsample_name = output.accession.lower().replace("-", "_")
+                for experiment in experiments:
+                    outputs = get_outputs(experiment.accession, ())
                     
-                    row = {
-                        "sample_name": sample_name,  
-                        "subsample_name": subsample_name,
-                        "srr": output.accession,  
-                        "srx": experiment.accession,
-                        "total_spots": output.total_spots,
-                        "total_bases": output.total_bases,
-                        "size": output.size,
-                        "published": output.published,
-                        "nreads": output.nreads,
-                        "nspots": output.nspots,
-                        "a_count": output.a_count,
-                        "c_count": output.c_count,
-                        "g_count": output.g_count,
-                        "t_count": output.t_count,
-                        "n_count": output.n_count,
+                    for output in outputs:
+                        subsample_name = output.accession.lower().replace("-", "_")
                         
-                        # Experiment metadata
-                        "read_type": experiment.library_layout,
-                        "data_source": experiment.platform_type,
-                        "library_name": experiment.library_name,
-                        "library_strategy": experiment.library_strategy,
-                        "library_source": experiment.library_source,
-                        "library_selection": experiment.library_selection,
-                        "library_layout": experiment.library_layout,
-                        "nominal_length": experiment.nominal_length,
-                        "instrument_model": experiment.instrument_model,
-                        "platform_type": experiment.platform_type,
-                        "experiment_title": experiment.title
-                    }
-                    
-                    for i, file in enumerate(output.files, 1):
-                        row[f"file_{i}"] = file.url
-                        row[f"file_{i}_md5"] = file.md5
-                        row[f"file_{i}_size"] = file.size
-                        row[f"file_{i}_date"] = file.date
-                    
-                    subsamples_data.append(row)
+                        row = {
+                            "sample_name": sample_name,  
+                            "subsample_name": subsample_name,
+                            "srr": output.accession,  
+                            "srx": experiment.accession,
+                            "total_spots": output.total_spots,
+                            "total_bases": output.total_bases,
+                            "size": output.size,
+                            "published": output.published,
+                            "nreads": output.nreads,
+                            "nspots": output.nspots,
+                            "a_count": output.a_count,
+                            "c_count": output.c_count,
+                            "g_count": output.g_count,
+                            "t_count": output.t_count,
+                            "n_count": output.n_count,
+                            
+                            # Experiment metadata
+                            "read_type": experiment.library_layout,
+                            "data_source": experiment.platform_type,
+                            "library_name": experiment.library_name,
+                            "library_strategy": experiment.library_strategy,
+                            "library_source": experiment.library_source,
+                            "library_selection": experiment.library_selection,
+                            "library_layout": experiment.library_layout,
+                            "nominal_length": experiment.nominal_length,
+                            "instrument_model": experiment.instrument_model,
+                            "platform_type": experiment.platform_type,
+                            "experiment_title": experiment.title
+                        }
+                        
+                        for i, file in enumerate(output.files, 1):
+                            row[f"file_{i}"] = file["url"]
+                            row[f"file_{i}_md5"] = file["md5"]
+                            row[f"file_{i}_size"] = file["size"]
+                            row[f"file_{i}_date"] = file["date"]
+                        
+                        yield row
         
         samples_csv_path = output_path / f"{project.accession}_samples.csv"
         
-        if samples_data:
-            fieldnames = set()
-            for row in samples_data:
-                fieldnames.update(row.keys())
+        if self.samples.items:
+            fieldnames = sample_fieldnames.union(SAMPLE_BASE_FIELDS)
+            if has_study:
+                fieldnames.update(STUDY_FIELDS)
             
             important_fields = [
                 "sample_name", "protocol", "organism", "sample_title", 
@@ -199,33 +342,39 @@ class GenomicData(BaseModel):
             ]
             
             # Create the ordered fieldnames list
-            ordered_fieldnames = [f for f in important_fields if f in fieldnames]
-            ordered_fieldnames.extend([f for f in sorted(fieldnames) if f not in ordered_fieldnames])
+            ordered_fieldnames = list(chain(
+                (f for f in important_fields if f in fieldnames),
+                sorted(fieldnames.difference(important_fields))
+            ))
             
-            with open(samples_csv_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=ordered_fieldnames)
-                writer.writeheader()
-                writer.writerows(samples_data)
+            with open(samples_csv_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) as f:
+                writer = csv.writer(f)
+                writer.writerow(ordered_fieldnames)
+                get = dict.get
+                writer.writerows([get(row, k, '') for k in ordered_fieldnames] for row in sample_rows())
         
         subsamples_csv_path = output_path / f"{project.accession}_subsamples.csv"
         
-        if subsamples_data:
-            fieldnames = set()
-            for row in subsamples_data:
-                fieldnames.update(row.keys())
+        if has_subsamples:
+            fieldnames = set(SUBSAMPLE_BASE_FIELDS)
+            for i in range(1, max_files + 1):
+                fieldnames.update((f"file_{i}", f"file_{i}_md5", f"file_{i}_size", f"file_{i}_date"))
             
             important_fields = [
                 "sample_name", "subsample_name", "srr", "srx", "library_strategy", 
                 "library_source", "library_selection", "instrument_model"
             ]
             
-            ordered_fieldnames = [f for f in important_fields if f in fieldnames]
-            ordered_fieldnames.extend([f for f in sorted(fieldnames) if f not in ordered_fieldnames])
+            ordered_fieldnames = list(chain(
+                (f for f in important_fields if f in fieldnames),
+                sorted(fieldnames.difference(important_fields))
+            ))
             
-            with open(subsamples_csv_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=ordered_fieldnames)
-                writer.writeheader()
-                writer.writerows(subsamples_data)
+            with open(subsamples_csv_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) as f:
+                writer = csv.writer(f)
+                writer.writerow(ordered_fieldnames)
+                get = dict.get
+                writer.writerows([get(row, k, '') for k in ordered_fieldnames] for row in subsample_rows())
         
         return str(config_path)
         
@@ -243,6 +392,7 @@ class GenomicData(BaseModel):
         output_path = pathlib.Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
+        now_iso = datetime.now().isoformat()
         bioproject = self.project
         
         crate_name = bioproject.title
@@ -252,7 +402,7 @@ class GenomicData(BaseModel):
         if bioproject.organism_name:
             crate_keywords.append(bioproject.organism_name)
         
-        crate_keywords.extend([dt.replace('e', '') for dt in bioproject.data_types])
+        crate_keywords.extend(dict.fromkeys(dt.translate(_DROP_E) for dt in bioproject.data_types))
         if bioproject.project_data_type:
             crate_keywords.append(bioproject.project_data_type)
         
@@ -265,28 +415,30 @@ class GenomicData(BaseModel):
             license="https://creativecommons.org/publicdomain/zero/1.0/",
             hasPart=[],
             author=author,
-            datePublished=datetime.now().isoformat(),
+            datePublished=now_iso,
             associatedPublication="",
             isPartOf=[],
             version="1.0",
             sameAs=f"https://www.ncbi.nlm.nih.gov/bioproject/{bioproject.accession}"
         )
         
-        metadata_path = output_path / "ro-crate-metadata.json"
-        with open(metadata_path, 'r') as f:
-            crate_data = json.load(f)
-        
         id_mapping = {}
         cell_line_entities = {}
+        # Cellosaurus results by cell line name, so samples sharing a cell line trigger one lookup
+        cell_line_lookups = {}
+        
+        # Entities are collected in creation order and appended to the crate in one call
+        crate_entities = []
         
         sample_guids = []
         for sample in self.samples.items:
             accession = sample.accession
+            attributes = sample.attributes
             
             cell_line = None
-            for attr_name in ['cell_line', 'cell line', 'cell_line_name']:
-                if attr_name in sample.attributes:
-                    cell_line = sample.attributes[attr_name]
+            for attr_name in ('cell_line', 'cell line', 'cell_line_name'):
+                if attr_name in attributes:
+                    cell_line = attributes[attr_name]
                     break
             
             cell_line_entity = None
@@ -294,15 +446,18 @@ class GenomicData(BaseModel):
             #If cell line given look it up on cellasasrous
             if cell_line:
                 keywords.append(cell_line)
-                try:
-                    cell_line_entity = get_cell_line_entity(cell_line)
-                    if cell_line_entity:
-                        cell_line_entities[cell_line] = cell_line_entity
-                        cell_line_file = output_path / f"cell_line_{cell_line.replace(' ', '_')}.json"
-                        with open(cell_line_file, 'w') as f:
-                            json.dump(cell_line_entity, f, indent=2)
-                except Exception:
-                    pass
+                if cell_line in cell_line_lookups:
+                    cell_line_entity = cell_line_lookups[cell_line]
+                else:
+                    try:
+                        cell_line_entity = get_cell_line_entity(cell_line)
+                        cell_line_lookups[cell_line] = cell_line_entity
+                        if cell_line_entity:
+                            cell_line_entities[cell_line] = cell_line_entity
+                            cell_line_file = output_path / f"cell_line_{cell_line.replace(' ', '_')}.json"
+                            write_json(cell_line_file, cell_line_entity)
+                    except Exception:
+                        pass
             
             sample_data = {
                 "guid": None,
@@ -315,28 +470,15 @@ class GenomicData(BaseModel):
                 "version": "1.0",
                 "contentUrl":f"https://www.ncbi.nlm.nih.gov/biosample/{accession}",
             }
-            additional_properties = []
-
-            additional_properties.append({
-                "@type": "PropertyValue",
-                "propertyID": "accession",
-                "value": accession
-            })
-            additional_properties.append({
-                "@type": "PropertyValue",
-                "propertyID": "scientific_name",
-                "value": sample.scientific_name
-            })
-            additional_properties.append({
-                "@type": "PropertyValue",
-                "propertyID": "taxon_id",
-                "value": sample.taxon_id
-            })
+            additional_properties = [
+                {"@type": "PropertyValue", "propertyID": name, "value": getattr(sample, name)}
+                for name in SAMPLE_PROPERTY_FIELDS
+            ]
 
             if cell_line_entity:
                 sample_data["cellLineReference"] = cell_line_entity["@id"]
             else:
-                for attr_name, attr_value in sample.attributes.items():
+                for attr_name, attr_value in attributes.items():
                     additional_properties.append({
                         "@type": "PropertyValue",
                         "propertyID": attr_name,
@@ -350,7 +492,7 @@ class GenomicData(BaseModel):
             id_mapping[accession] = sample.guid
             sample_guids.append(sample.guid)
             
-            AppendCrate(pathlib.Path(output_path), [sample])
+            crate_entities.append(sample)
         
         instrument_software_guids = {}
         experiment_objects = {}
@@ -379,7 +521,7 @@ class GenomicData(BaseModel):
                     contentUrl=None, 
                     cratePath=output_path,
                 )
-                AppendCrate(pathlib.Path(output_path), [instrument_software])
+                crate_entities.append(instrument_software)
                 instrument_software_guids[instrument_key] = instrument_software.guid
             
             instrument_software_guid = instrument_software_guids[instrument_key]
@@ -389,43 +531,10 @@ class GenomicData(BaseModel):
             used_samples = [sample_guid] if sample_guid else []
             
 
-            experiment_properties = []
-
-            experiment_properties.append({
-                "@type": "PropertyValue",
-                "propertyID": "accession",
-                "value": accession
-            })
-            experiment_properties.append({
-                "@type": "PropertyValue",
-                "propertyID": "library_name",
-                "value": experiment.library_name
-            })
-            experiment_properties.append({
-                "@type": "PropertyValue",
-                "propertyID": "library_strategy",
-                "value": experiment.library_strategy
-            })
-            experiment_properties.append({
-                "@type": "PropertyValue",
-                "propertyID": "library_source",
-                "value": experiment.library_source
-            })
-            experiment_properties.append({
-                "@type": "PropertyValue",
-                "propertyID": "library_selection",
-                "value": experiment.library_selection
-            })
-            experiment_properties.append({
-                "@type": "PropertyValue",
-                "propertyID": "library_layout",
-                "value": experiment.library_layout
-            })
-            experiment_properties.append({
-                "@type": "PropertyValue",
-                "propertyID": "nominal_length",
-                "value": experiment.nominal_length
-            })
+            experiment_properties = [
+                {"@type": "PropertyValue", "propertyID": name, "value": getattr(experiment, name)}
+                for name in EXPERIMENT_PROPERTY_FIELDS
+            ]
 
             experiment_instance = GenerateExperiment(
                 guid=None,
@@ -433,7 +542,7 @@ class GenomicData(BaseModel):
                 experimentType=experiment.library_strategy,
                 runBy=author, 
                 description=f"{title} using {instrument_model}",
-                datePerformed=datetime.now().isoformat(),
+                datePerformed=now_iso,
                 usedInstrument=[instrument_software_guid] if instrument_software_guid else [],
                 usedSample=used_samples,
                 generated=[],
@@ -473,7 +582,7 @@ class GenomicData(BaseModel):
             )
             
             id_mapping[accession] = run_dataset.guid
-            AppendCrate(pathlib.Path(output_path), [run_dataset])
+            crate_entities.append(run_dataset)
             
             if experiment_ref in experiment_guids:
                 experiment_computation = experiment_objects.get(experiment_ref)
@@ -482,43 +591,61 @@ class GenomicData(BaseModel):
                         experiment_computation.generated = []
                     experiment_computation.generated.append({"@id": run_dataset.guid})
         
-        AppendCrate(pathlib.Path(output_path), list(experiment_objects.values()))
+        crate_entities.extend(experiment_objects.values())
         
-        if cell_line_entities:
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+        # The metadata file is read once, updated in memory and written back once
+        with CrateWriter(output_path) as crate:
+            crate.extend(crate_entities)
             
-            for entity in cell_line_entities.values():
-                entity_id = entity["@id"]
-                if not any(item.get('@id') == entity_id for item in metadata.get('@graph', [])):
-                    metadata['@graph'].append(entity)
-            
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
-        
-        with open(metadata_path, 'r') as f:
-            crate_data = json.load(f)
-            root_id = crate_data["@graph"][1]["@id"]
+            if cell_line_entities:
+                graph = crate.crate['@graph']
+                seen_ids = {item.get('@id') for item in graph}
+                for entity in cell_line_entities.values():
+                    if entity["@id"] not in seen_ids:
+                        graph.append(entity)
+                        seen_ids.add(entity["@id"])
         
-        return root_id
+        return rocrate_data["@id"]
     
     @classmethod
-    def from_api(cls, accession: str, api_key: str = "", details_dir: str = "details") -> 'GenomicData':
+    def from_api(cls, accession: str, api_key: str = "", details_dir: str = "details",
+                 use_cache: bool = True, cache_ttl: float = BIOPROJECT_CACHE_TTL) -> 'GenomicData':
         """
         Create a GenomicData model by fetching data directly from NCBI API.
         
+        Fetched data is cached as {accession}.bioproject.json under details_dir and
+        reused while it is younger than cache_ttl seconds.
+        
         Args:
             accession: BioProject accession number (e.g., PRJDB2884)
             api_key: NCBI API key (optional, default provided)
+            details_dir: Directory holding the cached BioProject data
+            use_cache: Whether to read and write the on-disk cache
+            cache_ttl: Maximum age in seconds of a cached result
             
         Returns:
             Populated GenomicData instance
         """
         
-        data = fetch_bioproject_data(accession, api_key, details_dir)
+        cache_file = pathlib.Path(details_dir) / f"{accession}.bioproject.json"
+        data = None
+        
+        if use_cache and cache_file.exists() and time.time() - cache_file.stat().st_mtime < cache_ttl:
+            try:
+                data = read_json(cache_file)
+                data.pop("_meta", None)
+            except (OSError, ValueError):
+                data = None
         
         if not data:
-            raise ValueError(f"Failed to fetch data for BioProject: {accession}")
+            data = fetch_bioproject_data(accession, api_key, details_dir)
+            
+            if not data:
+                raise ValueError(f"Failed to fetch data for BioProject: {accession}")
+            
+            if use_cache:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                write_json(cache_file, {**data, "_meta": {"accession": accession, "fetched": datetime.now().isoformat()}})
             
         # Use the from_json method to convert to GenomicData
         return cls.from_json(data)
@@ -534,12 +661,6 @@ class GenomicData(BaseModel):
         Returns:
             Populated GenomicData instance
         """
-        sample_to_study_map = {}
-        for experiment in data.get("experiments", []):
-            sample_ref = experiment.get("sample_ref") or experiment.get("title", "")
-            study_ref = experiment.get("study_ref") or experiment.get("title", "")
-            sample_to_study_map[sample_ref] = study_ref
-        
         studies_map = {}
         if data.get("studies"):
             studies_map = {study.get("accession") or study.get("title", ""): study for study in data.get("studies", [])}
@@ -577,90 +698,95 @@ class GenomicData(BaseModel):
             access=submission.get("access", "")
         )
         
-        samples = []
-        for biosample in data.get("biosamples", []):
-            sample_ref = biosample.get("accession") or biosample.get("title") or biosample.get("scientific_name", "")
-            study_ref = sample_to_study_map.get(sample_ref)
-            study_data = studies_map.get(study_ref, {})
-            
-            sample = Sample(
-                accession=biosample.get("accession") or biosample.get("title") or biosample.get("scientific_name", ""),
-                title=biosample.get("title", ""),
-                scientific_name=biosample.get("scientific_name", ""),
-                taxon_id=biosample.get("taxon_id", ""),
-                attributes=biosample.get("attributes", {}),
-                
-                study_accession=study_ref,
-                study_center_name=study_data.get("center_name"),
-                study_title=study_data.get("title"),
-                study_abstract=study_data.get("abstract"),
-                study_description=study_data.get("description")
-            )
-            samples.append(sample)
-        
+        # Records are collected as plain dicts and validated once per collection,
+        # so pydantic-core handles every row in a single call.
+        # Experiments come first: the same pass maps each sample to its study.
+        sample_to_study_map = {}
         experiments = []
         for exp in data.get("experiments", []):
             design = exp.get("design", {})
             platform = exp.get("platform", {})
+            sample_ref = exp.get("sample_ref") or exp.get("title", "")
+            study_ref = exp.get("study_ref") or exp.get("title", "")
+            sample_to_study_map[sample_ref] = study_ref
             
-            experiment = Experiment(
-                accession=exp.get("accession") or exp.get("title", ""),
-                title=exp.get("title", ""),
-                study_ref=exp.get("study_ref") or exp.get("title", ""),
-                sample_ref=exp.get("sample_ref") or exp.get("title", ""),
+            experiments.append({
+                "accession": exp.get("accession") or exp.get("title", ""),
+                "title": exp.get("title", ""),
+                "study_ref": study_ref,
+                "sample_ref": sample_ref,
                 
-                library_name=design.get("library_name", ""),
-                library_strategy=design.get("library_strategy", ""),
-                library_source=design.get("library_source", ""),
-                library_selection=design.get("library_selection", ""),
-                library_layout=design.get("library_layout", ""),
-                nominal_length=design.get("nominal_length", ""),
+                "library_name": design.get("library_name", ""),
+                "library_strategy": _intern(design.get("library_strategy", "")),
+                "library_source": _intern(design.get("library_source", "")),
+                "library_selection": _intern(design.get("library_selection", "")),
+                "library_layout": _intern(design.get("library_layout", "")),
+                "nominal_length": design.get("nominal_length", ""),
                 
-                platform_type=platform.get("type", ""),
-                instrument_model=platform.get("instrument_model", "")
-            )
-            experiments.append(experiment)
+                "platform_type": _intern(platform.get("type", "")),
+                "instrument_model": _intern(platform.get("instrument_model", ""))
+            })
+        
+        samples = []
+        for biosample in data.get("biosamples", []):
+            sample_ref = biosample.get("accession") or biosample.get("title") or biosample.get("scientific_name", "")
+            study_ref = sample_to_study_map.get(sample_ref)
+            study_data = studies_map.get(study_ref, {})
+            
+            samples.append({
+                "accession": sample_ref,
+                "title": biosample.get("title", ""),
+                "scientific_name": _intern(biosample.get("scientific_name", "")),
+                "taxon_id": _intern(biosample.get("taxon_id", "")),
+                "attributes": {_intern(key): _intern(value) for key, value in biosample.get("attributes", {}).items()},
+                
+                "study_accession": study_ref,
+                "study_center_name": _intern(study_data.get("center_name")),
+                "study_title": _intern(study_data.get("title")),
+                "study_abstract": study_data.get("abstract"),
+                "study_description": study_data.get("description")
+            })
         
         outputs = []
         for run in data.get("runs", []):
             base_composition = run.get("base_composition", {})
             
             output_files = [
-                OutputFile(
-                    filename=file.get("filename") or file.get("url", "").split("/")[-1] or "",
-                    size=file.get("size", 0),
-                    date=file.get("date", ""),
-                    url=file.get("url", ""),
-                    md5=file.get("md5", "")
-                )
+                {
+                    "filename": file.get("filename") or file.get("url", "").split("/")[-1] or "",
+                    "size": file.get("size", 0),
+                    "date": file.get("date", ""),
+                    "url": file.get("url", ""),
+                    "md5": file.get("md5", "")
+                }
                 for file in run.get("files", [])
             ]
             
-            output = Output(
-                accession=run.get("accession") or run.get("title", ""),
-                title=run.get("title", ""),
-                experiment_ref=run.get("experiment_ref") or run.get("title", ""),
-                total_spots=run.get("total_spots", 0),
-                total_bases=run.get("total_bases", 0),
-                size=run.get("size", 0),
-                published=run.get("published", ""),
-                files=output_files,
-                nreads=run.get("nreads", 0),
-                nspots=run.get("nspots", 0),
+            outputs.append({
+                "accession": run.get("accession") or run.get("title", ""),
+                "title": run.get("title", ""),
+                "experiment_ref": run.get("experiment_ref") or run.get("title", ""),
+                "total_spots": run.get("total_spots", 0),
+                "total_bases": run.get("total_bases", 0),
+                "size": run.get("size", 0),
+                "published": run.get("published", ""),
+                "files": output_files,
+                "nreads": run.get("nreads", 0),
+                "nspots": run.get("nspots", 0),
                 
-                a_count=base_composition.get("A", 0),
-                c_count=base_composition.get("C", 0),
-                g_count=base_composition.get("G", 0),
-                t_count=base_composition.get("T", 0),
-                n_count=base_composition.get("N", 0)
-            )
-            outputs.append(output)
+                "a_count": base_composition.get("A", 0),
+                "c_count": base_composition.get("C", 0),
+                "g_count": base_composition.get("G", 0),
+                "t_count": base_composition.get("T", 0),
+                "n_count": base_composition.get("N", 0)
+            })
         
-        return cls(
+        # The parts are validated above, so the container is assembled without revalidation
+        return cls.model_construct(
             project=project,
-            samples=Samples(items=samples),
-            experiments=Experiments(items=experiments),
-            outputs=Outputs(items=outputs)
+            samples=Samples.model_validate({"items": samples}),
+            experiments=Experiments.model_validate({"items": experiments}),
+            outputs=Outputs.model_validate({"items": outputs})
         )
     
     @classmethod
@@ -677,30 +803,18 @@ class GenomicData(BaseModel):
         
         config_path = pathlib.Path(config_path)
         base_dir = config_path.parent
+        today = datetime.now().strftime('%Y-%m-%d')
+        # Module-level helpers used in the row loops, bound as locals
+        intern, intern_max_length, make_output_file = _intern, INTERN_MAX_LENGTH, OutputFile
         
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
         
         sample_file = base_dir / config.get('sample_table', '')
         subsample_file = base_dir / config.get('subsample_table', '')
         
-        samples_data = []
-        sample_map = {}
-        
-        if sample_file.exists():
-            with open(sample_file, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    samples_data.append(row)
-                    sample_map[row['sample_name']] = row
-        
-        subsamples_data = []
-        
-        if subsample_file.exists():
-            with open(subsample_file, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    subsamples_data.append(row)
+        sample_columns, sample_missing, sample_rows = _read_pep_table(sample_file) if sample_file.exists() else ({}, 0, [])
+        subsample_columns, subsample_missing, subsample_rows = _read_pep_table(subsample_file) if subsample_file.exists() else ({}, 0, [])
         
         experiment_metadata = config.get('experiment_metadata', {})
         
@@ -711,7 +825,7 @@ class GenomicData(BaseModel):
             organism_name=experiment_metadata.get('series_sample_organism', ''),
             title=experiment_metadata.get('series_title', ''),
             description=experiment_metadata.get('series_summary', experiment_metadata.get('series_overall_design', '')),
-            release_date=experiment_metadata.get('series_last_update_date', datetime.now().strftime('%Y-%m-%d')),
+            release_date=experiment_metadata.get('series_last_update_date', today),
             
             organism_species=experiment_metadata.get('series_platform_taxid', ''),
             organism_taxID=experiment_metadata.get('series_platform_taxid', ''),
@@ -724,122 +838,118 @@ class GenomicData(BaseModel):
             access="public"
         )
         
+        # Column indices are resolved once per table; absent columns point at the empty trailing cell
+        def sample_column(name):
+            return sample_columns.get(name, sample_missing)
+        
+        i_sample_name, i_sample_accession, i_gsm_id = sample_column('sample_name'), sample_column('sample_accession'), sample_column('gsm_id')
+        i_title, i_sample_title = sample_column('title'), sample_column('sample_title')
+        i_scientific_name, i_organism, i_organism_ch1 = sample_column('scientific_name'), sample_column('organism'), sample_column('sample_organism_ch1')
+        i_taxon_id, i_taxid_ch1 = sample_column('taxon_id'), sample_column('sample_taxid_ch1')
+        study_values = itemgetter(*map(sample_column, PEP_STUDY_FIELDS))
+        # Columns stored as sample attributes, i.e. all but those read into dedicated fields
+        attribute_columns = [(key, i) for key, i in sample_columns.items() if key not in PEP_SAMPLE_SKIP_KEYS]
+        
         samples = []
         
-        for sample_row in samples_data:
-            sample_name = sample_row.get('sample_name', '')
-            accession = sample_row.get('sample_accession', sample_row.get('gsm_id', sample_name))
+        for row in sample_rows:
+            sample_name = row[i_sample_name]
+            accession = row[i_sample_accession] or row[i_gsm_id] or sample_name
             
             attributes = {}
-            for key, value in sample_row.items():
-                #Skip keys that are stored outside of attributes
-                if key in ['sample_name', 'sample_accession', 'scientific_name', 'taxon_id', 
-                          'title', 'accession', 'study_accession', 'study_title', 
-                          'study_center_name', 'study_abstract', 'study_description']:
-                    continue
-                    
-                if value and value != "":
-                    attributes[key] = value
+            for key, i in attribute_columns:
+                value = row[i]
+                if value:
+                    attributes[key] = intern(value) if len(value) < intern_max_length else value
             
-            sample = Sample(
+            sample = dict(zip(PEP_STUDY_FIELDS, study_values(row)))
+            sample.update(
                 accession=accession,
-                title=sample_row.get('title', sample_row.get('sample_title', '')),
-                scientific_name=sample_row.get('scientific_name', sample_row.get('organism', sample_row.get('sample_organism_ch1', ''))),
-                taxon_id=sample_row.get('taxon_id', sample_row.get('sample_taxid_ch1', '')),
-                attributes=attributes,
-                
-                study_accession=sample_row.get('study_accession', ''),
-                study_center_name=sample_row.get('study_center_name', ''),
-                study_title=sample_row.get('study_title', ''),
-                study_abstract=sample_row.get('study_abstract', ''),
-                study_description=sample_row.get('study_description', '')
+                title=row[i_title] or row[i_sample_title],
+                scientific_name=intern(row[i_scientific_name] or row[i_organism] or row[i_organism_ch1]),
+                taxon_id=intern(row[i_taxon_id] or row[i_taxid_ch1]),
+                attributes=attributes
             )
-            
             samples.append(sample)
         
-        experiments = []
-        experiment_map = {}
+        # Subsample rows refer to samples by their PEP sample_name; the first matching sample wins
+        sample_key_map = {}
+        for sample in samples:
+            sample_key_map.setdefault(sample["accession"].lower().replace("-", "_"), sample["accession"])
         
-        for subsample_row in subsamples_data:
-            sample_name = subsample_row.get('sample_name', '')
-            experiment_accession = subsample_row.get('srx', '')
-            
-            if experiment_accession in experiment_map:
-                continue
-                
-            sample_accession = ""
-            for sample in samples:
-                if sample.accession.lower().replace("-", "_") == sample_name:
-                    sample_accession = sample.accession
-                    break
-            
-            experiment = Experiment(
-                accession=experiment_accession,
-                title=subsample_row.get('experiment_title', ''),
-                study_ref=subsample_row.get('study_accession', ''),
-                sample_ref=sample_accession,
-                
-                library_name=subsample_row.get('library_name', ''),
-                library_strategy=subsample_row.get('library_strategy', ''),
-                library_source=subsample_row.get('library_source', ''),
-                library_selection=subsample_row.get('library_selection', ''),
-                library_layout=subsample_row.get('library_layout', subsample_row.get('read_type', '')),
-                nominal_length=subsample_row.get('nominal_length', ''),
-                
-                platform_type=subsample_row.get('platform_type', subsample_row.get('data_source', '')),
-                instrument_model=subsample_row.get('instrument_model', '')
-            )
-            
-            experiments.append(experiment)
-            experiment_map[experiment_accession] = experiment
+        def subsample_column(name):
+            return subsample_columns.get(name, subsample_missing)
+        
+        i_srx, i_sample_name = subsample_column('srx'), subsample_column('sample_name')
+        i_experiment_title, i_study_accession = subsample_column('experiment_title'), subsample_column('study_accession')
+        i_library_name, i_library_strategy, i_library_source, i_library_selection = (
+            subsample_column('library_name'), subsample_column('library_strategy'), subsample_column('library_source'), subsample_column('library_selection')
+        )
+        i_library_layout, i_read_type, i_nominal_length = subsample_column('library_layout'), subsample_column('read_type'), subsample_column('nominal_length')
+        i_platform_type, i_data_source, i_instrument_model = subsample_column('platform_type'), subsample_column('data_source'), subsample_column('instrument_model')
+        output_values = itemgetter(*(subsample_column(name) for _, name in PEP_OUTPUT_COLUMNS))
+        output_fields = [field for field, _ in PEP_OUTPUT_COLUMNS]
+        
+        # The file_N column groups (url, size, date, md5) run up to the first missing file_N
+        file_columns = []
+        while f'file_{len(file_columns) + 1}' in subsample_columns:
+            n = len(file_columns) + 1
+            file_columns.append((subsample_column(f'file_{n}'), subsample_column(f'file_{n}_size'), subsample_column(f'file_{n}_date'), subsample_column(f'file_{n}_md5')))
         
+        experiments = []
+        seen_experiments = set()
         outputs = []
         
-        for subsample_row in subsamples_data:
-            output_accession = subsample_row.get('srr', '')
-            experiment_accession = subsample_row.get('srx', '')
+        # One pass over the subsample rows builds each run and, the first time it is seen, its experiment
+        for row in subsample_rows:
+            experiment_accession = row[i_srx]
+            
+            if experiment_accession not in seen_experiments:
+                sample_accession = sample_key_map.get(row[i_sample_name], "")
+                
+                experiments.append(dict(
+                    accession=experiment_accession,
+                    title=row[i_experiment_title],
+                    study_ref=row[i_study_accession],
+                    sample_ref=sample_accession,
+                    
+                    library_name=row[i_library_name],
+                    library_strategy=intern(row[i_library_strategy]),
+                    library_source=intern(row[i_library_source]),
+                    library_selection=intern(row[i_library_selection]),
+                    library_layout=intern(row[i_library_layout] or row[i_read_type]),
+                    nominal_length=row[i_nominal_length],
+                    
+                    platform_type=intern(row[i_platform_type] or row[i_data_source]),
+                    instrument_model=intern(row[i_instrument_model])
+                ))
+                seen_experiments.add(experiment_accession)
             
             output_files = []
-            i = 1
-            while f'file_{i}' in subsample_row:
-                file_url = subsample_row.get(f'file_{i}', '')
+            for i_url, i_file_size, i_file_date, i_md5 in file_columns:
+                file_url = row[i_url]
                 if file_url:
-                    output_file = OutputFile(
-                        filename=os.path.basename(file_url),
-                        size=subsample_row.get(f'file_{i}_size', ''),
-                        date=subsample_row.get(f'file_{i}_date', ''),
+                    output_file = make_output_file(
+                        filename=file_url.rpartition('/')[2],
+                        size=row[i_file_size],
+                        date=row[i_file_date],
                         url=file_url,
-                        md5=subsample_row.get(f'file_{i}_md5', '')
+                        md5=row[i_md5]
                     )
                     output_files.append(output_file)
-                i += 1
-            
-            output = Output(
-                accession=output_accession,
-                title=subsample_row.get('subsample_name', ''),
-                experiment_ref=experiment_accession,
-                total_spots=subsample_row.get('total_spots', ''),
-                total_bases=subsample_row.get('total_bases', ''),
-                size=subsample_row.get('size', ''),
-                published=subsample_row.get('published', ''),
-                files=output_files,
-                nreads=subsample_row.get('nreads', ''),
-                nspots=subsample_row.get('nspots', ''),
-                
-                a_count=subsample_row.get('a_count', ''),
-                c_count=subsample_row.get('c_count', ''),
-                g_count=subsample_row.get('g_count', ''),
-                t_count=subsample_row.get('t_count', ''),
-                n_count=subsample_row.get('n_count', '')
-            )
             
+            output = dict(zip(output_fields, output_values(row)))
+            output["experiment_ref"] = experiment_accession
+            output["files"] = output_files
             outputs.append(output)
         
-        genomic_data = cls(
+        # Records are validated once per collection, as in from_json, and the
+        # container is assembled from the validated parts without revalidation
+        genomic_data = cls.model_construct(
             project=project,
-            samples=Samples(items=samples),
-            experiments=Experiments(items=experiments),
-            outputs=Outputs(items=outputs)
+            samples=Samples.model_validate({"items": samples}),
+            experiments=Experiments.model_validate({"items": experiments}),
+            outputs=Outputs.model_validate({"items": outputs})
         )
         
         return genomic_data
@@ -857,11 +967,9 @@ class GenomicData(BaseModel):
         """
         
         metadata_path = pathlib.Path(metadata_path)
-        
-        with open(metadata_path, 'r') as f:
-            crate_data = json.load(f)
-                
-        graph = crate_data.get('@graph', [])
+        today = datetime.now().strftime('%Y-%m-%d')
+        # Module-level helpers used in the entity loops, bound as locals
+        ref_ids, make_output_file = _ref_ids, OutputFile
         
         entities_by_id = {}
         samples_list = []
@@ -871,7 +979,16 @@ class GenomicData(BaseModel):
         
         root_dataset = None
         
-        for entity in graph:
+        # Buckets in match precedence order. Types are usually full EVI IRIs, so the
+        # name after '#' is looked up directly; other spellings fall back to the substring match.
+        buckets = {
+            'Sample': samples_list.append,
+            'Computation': computations_list.append,
+            'Software': software_list.append,
+            'Dataset': datasets_list.append,
+        }
+        
+        for entity in iter_graph(metadata_path):
             entity_id = entity.get('@id', '')
             entity_type = entity.get('@type', '')
             
@@ -879,25 +996,25 @@ class GenomicData(BaseModel):
             
             if isinstance(entity_type, list):
                 root_dataset = entity
-            elif 'Sample' in entity_type:
-                samples_list.append(entity)
-            elif 'Computation' in entity_type:
-                computations_list.append(entity)
-            elif 'Software' in entity_type:
-                software_list.append(entity)
-            elif 'Dataset' in entity_type and entity_id != './':
-                datasets_list.append(entity)
+                continue
+            
+            kind = entity_type.rpartition('#')[2]
+            if kind not in buckets:
+                kind = next((name for name in buckets if name in entity_type), None)
+            
+            if kind and not (kind == 'Dataset' and entity_id == './'):
+                buckets[kind](entity)
         
         project = Project(
             id=root_dataset.get('identifier', 'unknown'),
             accession=root_dataset.get('identifier', root_dataset.get('name', 'unknown')),
             archive=root_dataset.get('sdPublisher', {}).get('name', 'Unknown') if isinstance(root_dataset.get('sdPublisher'), dict) else 'Unknown',
-            organism_name=next((k for k in root_dataset.get('keywords', []) if 'sapiens' in k or 'elegans' in k), ''),
+            organism_name=next((k for k in root_dataset.get('keywords', ()) if _SPECIES_SEARCH(k)), ''),
             title=root_dataset.get('name', ''),
             description=root_dataset.get('description', ''),
-            release_date=root_dataset.get('datePublished', datetime.now().strftime('%Y-%m-%d')),
+            release_date=root_dataset.get('datePublished', today),
             
-            submitted_date=root_dataset.get('dateCreated', datetime.now().strftime('%Y-%m-%d')),
+            submitted_date=root_dataset.get('dateCreated', today),
             organization_role="owner",
             organization_type="center",
             organization_name=root_dataset.get('creator', {}).get('name', '') if isinstance(root_dataset.get('creator'), dict) else '',
@@ -914,18 +1031,16 @@ class GenomicData(BaseModel):
             
             attributes = {}
             for key, value in sample_entity.items():
-                if key not in ['@id', '@type', 'accession', 'title', 'scientific_name', 'taxon_id', 'name', 'description', 'keywords', 'author', 'format', 'version']:
+                if key not in ROCRATE_SAMPLE_SKIP_KEYS:
                     attributes[key] = str(value)
             
-            sample = Sample(
+            samples.append(dict(
                 accession=accession,
                 title=sample_entity.get('name', sample_entity.get('title', '')),
                 scientific_name=sample_entity.get('scientific_name', ''),
                 taxon_id=sample_entity.get('taxon_id', ''),
                 attributes=attributes,
-            )
-            
-            samples.append(sample)
+            ))
             sample_id_to_accession[entity_id] = accession
         
         experiments = []
@@ -953,28 +1068,20 @@ class GenomicData(BaseModel):
                 keywords = computation.get('keywords', [])
                 if isinstance(keywords, list):
                     for keyword in keywords:
-                        if not library_strategy and keyword in ['RNA-Seq', 'WGS', 'ChIP-Seq', 'Bisulfite-Seq']:
+                        if not library_strategy and keyword in LIBRARY_STRATEGY_KEYWORDS:
                             library_strategy = keyword
-                        if not library_source and keyword in ['GENOMIC', 'TRANSCRIPTOMIC', 'METAGENOMIC']:
+                        if not library_source and keyword in LIBRARY_SOURCE_KEYWORDS:
                             library_source = keyword
-                        if not library_selection and keyword in ['PCR', 'RANDOM', 'Hybrid Selection']:
+                        if not library_selection and keyword in LIBRARY_SELECTION_KEYWORDS:
                             library_selection = keyword
-                        if not library_layout and keyword in ['PAIRED', 'SINGLE']:
+                        if not library_layout and keyword in LIBRARY_LAYOUT_KEYWORDS:
                             library_layout = keyword
             
             instrument_model = computation.get('instrument_model', '')
             platform_type = computation.get('platform_type', '')
             
             if not instrument_model or not platform_type:
-                used_software_ids = []
-                if 'usedSoftware' in computation:
-                    if isinstance(computation['usedSoftware'], list):
-                        used_software_ids = [sw.get('@id') if isinstance(sw, dict) else sw for sw in computation['usedSoftware']]
-                    else:
-                        used_software_id = computation['usedSoftware'].get('@id') if isinstance(computation['usedSoftware'], dict) else computation['usedSoftware']
-                        used_software_ids = [used_software_id]
-                
-                for software_id in used_software_ids:
+                for software_id in ref_ids(computation.get('usedSoftware')):
                     software = entities_by_id.get(software_id, {})
                     if not instrument_model and 'instrument_model' in software:
                         instrument_model = software.get('instrument_model', '')
@@ -986,25 +1093,15 @@ class GenomicData(BaseModel):
                     elif not platform_type and 'keywords' in software:
                         keywords = software.get('keywords', [])
                         if isinstance(keywords, list):
-                            platform_candidates = [k for k in keywords if k.upper() in ['ILLUMINA', 'PACBIO', 'NANOPORE', 'OXFORD']]
-                            if platform_candidates:
-                                platform_type = platform_candidates[0]
-            
-            sample_refs = []
-            if 'usedDataset' in computation:
-                if isinstance(computation['usedDataset'], list):
-                    sample_refs = [sample_id_to_accession.get(ds.get('@id')) if isinstance(ds, dict) else sample_id_to_accession.get(ds) 
-                                for ds in computation['usedDataset']]
-                else:
-                    sample_id = computation['usedDataset'].get('@id') if isinstance(computation['usedDataset'], dict) else computation['usedDataset']
-                    if sample_id in sample_id_to_accession:
-                        sample_refs = [sample_id_to_accession[sample_id]]
+                            platform_type = next((k for k in keywords if k.upper() in PLATFORM_KEYWORDS), '')
+            
+            sample_refs = [sample_id_to_accession.get(sample_id) for sample_id in ref_ids(computation.get('usedDataset'))]
             
             for sample_ref in sample_refs:
                 if not sample_ref:
                     continue
                     
-                experiment = Experiment(
+                experiment = dict(
                     accession=accession,
                     title=computation.get('name', ''),
                     sample_ref=sample_ref,
@@ -1033,17 +1130,10 @@ class GenomicData(BaseModel):
             accession = dataset.get('accession', f"run-{entity_id.split('-')[-1]}")
             
             experiment_ref = ""
-            if 'generatedBy' in dataset:
-                if isinstance(dataset['generatedBy'], list):
-                    for comp_ref in dataset['generatedBy']:
-                        comp_id = comp_ref.get('@id') if isinstance(comp_ref, dict) else comp_ref
-                        if comp_id in computation_id_to_experiment:
-                            experiment_ref = computation_id_to_experiment[comp_id].accession
-                            break
-                else:
-                    comp_id = dataset['generatedBy'].get('@id') if isinstance(dataset['generatedBy'], dict) else dataset['generatedBy']
-                    if comp_id in computation_id_to_experiment:
-                        experiment_ref = computation_id_to_experiment[comp_id].accession
+            for comp_id in ref_ids(dataset.get('generatedBy')):
+                if comp_id in computation_id_to_experiment:
+                    experiment_ref = computation_id_to_experiment[comp_id]["accession"]
+                    break
             
             if not experiment_ref:
                 continue
@@ -1055,8 +1145,8 @@ class GenomicData(BaseModel):
                     content_urls = [content_urls]
                     
                 for url in content_urls:
-                    output_file = OutputFile(
-                        filename=os.path.basename(url) if isinstance(url, str) else '',
+                    output_file = make_output_file(
+                        filename=url.rpartition('/')[2] if isinstance(url, str) else '',
                         size=dataset.get('size', ""),
                         date=dataset.get('dateCreated', ''),
                         url=url,
@@ -1076,7 +1166,7 @@ class GenomicData(BaseModel):
             t_count = base_comp.get('T', "")
             n_count = base_comp.get('N', "")
             
-            output = Output(
+            outputs.append(dict(
                 accession=accession,
                 title=dataset.get('name', ''),
                 experiment_ref=experiment_ref,
@@ -1093,15 +1183,15 @@ class GenomicData(BaseModel):
                 g_count=g_count,
                 t_count=t_count,
                 n_count=n_count
-            )
-            
-            outputs.append(output)
+            ))
         
-        genomic_data = cls(
+        # Records are validated once per collection, as in from_json, and the
+        # container is assembled from the validated parts without revalidation
+        genomic_data = cls.model_construct(
             project=project,
-            samples=Samples(items=samples),
-            experiments=Experiments(items=experiments),
-            outputs=Outputs(items=outputs)
+            samples=Samples.model_validate({"items": samples}),
+            experiments=Experiments.model_validate({"items": experiments}),
+            outputs=Outputs.model_validate({"items": outputs})
         )
         
         return genomic_data
\ No newline at end of file
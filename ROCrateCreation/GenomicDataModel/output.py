@@ -1,7 +1,8 @@
 from pydantic import BaseModel
 from typing import List, Optional, Union
+from typing_extensions import TypedDict
 
-class OutputFile(BaseModel):
+class OutputFile(TypedDict):
     filename: str
     size: str
     date: str
@@ -0,0 +1,113 @@
+import json
+import pathlib
+from typing import Any, Dict, Iterable, Iterator, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def read_json(path: Union[str, pathlib.Path]) -> Any:
+    """
+    Load a JSON file, using orjson when it is installed.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def write_json(path: Union[str, pathlib.Path], data: Any) -> None:
+    """
+    Write data as indented JSON, using orjson when it is installed.
+    """
+    if orjson:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+def iter_graph(path: Union[str, pathlib.Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the entities of an RO-Crate metadata file's @graph one at a time.
+
+    With ijson installed the file is parsed incrementally, so the raw document is
+    never held in memory next to the parsed entities; otherwise it is loaded whole.
+    """
+    if ijson is None:
+        yield from read_json(path).get('@graph', [])
+        return
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, '@graph.item', use_float=True)
+
+
+class CrateWriter:
+    """
+    Context manager that buffers additions to an RO-Crate metadata file.
+
+    The metadata is read once on entry, entities passed to add() are appended
+    to the in-memory graph and listed in the root dataset's hasPart, and the
+    file is validated and written once when the block exits without error.
+    This is equivalent to calling AppendCrate with every entity at once; as
+    with AppendCrate, nothing is written if no entity was added.
+    """
+
+    def __init__(self, crate_path: Union[str, pathlib.Path], validate: bool = True):
+        """
+        Args:
+            crate_path: RO-Crate directory or path to its ro-crate-metadata.json
+            validate: Whether to validate the crate before writing it back
+        """
+        crate_path = pathlib.Path(crate_path)
+        self.metadata_path = crate_path / "ro-crate-metadata.json" if crate_path.is_dir() else crate_path
+        self.validate = validate
+        self.crate = None
+        self.added = 0
+
+    def __enter__(self) -> "CrateWriter":
+        self.crate = read_json(self.metadata_path)
+        return self
+
+    @property
+    def root(self) -> Dict[str, Any]:
+        """Root dataset entity, the second element of the graph after the descriptor."""
+        return self.crate["@graph"][1]
+
+    @property
+    def root_id(self) -> str:
+        return self.root["@id"]
+
+    def add(self, element: Any) -> str:
+        """
+        Append an entity to the crate and list it in the root dataset's hasPart.
+
+        Args:
+            element: fairscape model instance or an already serialized dictionary
+
+        Returns:
+            The @id of the added entity
+        """
+        element_data = element if isinstance(element, dict) else element.model_dump(by_alias=True, exclude_none=True)
+        self.crate["@graph"].append(element_data)
+        self.root.setdefault("hasPart", []).append({"@id": element_data["@id"]})
+        self.added += 1
+        return element_data["@id"]
+
+    def extend(self, elements: Iterable[Any]) -> None:
+        for element in elements:
+            self.add(element)
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None and self.added:
+            if self.validate:
+                from fairscape_cli.models.rocrate import ROCrateV1_2
+                ROCrateV1_2(**self.crate)
+            write_json(self.metadata_path, self.crate)
+        return False
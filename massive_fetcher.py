@@ -1,10 +1,74 @@
+import os
+import sys
+import time
+import tempfile
+import json
 import requests
 import uuid
-from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional
 from datetime import datetime
 from pathlib import Path
 
-def from_massive(massive_id: str) -> Dict[str, Any]:
+from ROCrateCreation.crate_writer import CrateWriter
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Shared by every fetch so repeated and concurrent requests to the MassIVE host
+# reuse pooled keep-alive connections instead of a new TCP+TLS handshake each,
+# retrying rate limits and transient server errors with a short backoff; the
+# last response is still returned so a persistent error surfaces as ValueError
+_session = requests.Session()
+_session.headers.update({"Accept": "application/json", "User-Agent": "fairscape/massive"})
+_session.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+))
+
+# Raw API responses are kept under the user cache directory and refetched after a day
+MASSIVE_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "fairscape" / "massive"
+MASSIVE_CACHE_TTL = 24 * 60 * 60
+
+# CV accessions of the species and datasetLink entries that are read, keyed to
+# the local field each one fills
+_SPECIES_FIELDS = {
+    "MS:1001469": "species_name",  # Taxonomy: scientific name
+    "MS:1001467": "taxon_id",  # Taxonomy: NCBI TaxID
+}
+_LINK_FIELDS = {
+    "MS:1002488": "dataset_uri",  # MassIVE dataset URI
+    "MS:1002852": "ftp_location",  # Dataset FTP location
+}
+
+# File format of a dataset type, taken from the first marker its name contains
+_DATASET_FORMATS = (
+    ("Raw", "raw"),
+    ("Processed", "mzIdentML"),
+    ("Protein", "fasta"),
+    ("Peptide", "mgf"),
+    ("Spectra", "mzML"),
+)
+
+# Fixed halves of the additionalProperty entries; each entity merges in its value
+_PROP_TAXON_ID = {"@type": "PropertyValue", "propertyID": "taxon_id"}
+_PROP_SCIENTIFIC_NAME = {"@type": "PropertyValue", "propertyID": "scientific_name"}
+_PROP_DATASET_ID = {"@type": "PropertyValue", "propertyID": "dataset_id"}
+_PROP_ACCESSION = {"@type": "PropertyValue", "propertyID": "accession"}
+_PROP_CV_LABEL = {"@type": "PropertyValue", "propertyID": "cvLabel"}
+_PROP_DATASET_URL = {"@type": "PropertyValue", "propertyID": "dataset_url"}
+_PROP_DATASET_TYPE = {"@type": "PropertyValue", "propertyID": "dataset_type"}
+
+def from_massive(massive_id: str, massive_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Fetch data from a MassIVE dataset and convert to Fairscape models.
     
@@ -12,19 +76,26 @@ def from_massive(massive_id: str) -> Dict[str, Any]:
     ----------
     massive_id : str
         MassIVE identifier (e.g., MSV000097523)
+    massive_data : Dict[str, Any], optional
+        Already fetched raw MassIVE data, fetched here when omitted
         
     Returns
     -------
     Dict[str, Any]
-        Dictionary containing Sample, Experiment, Instrument, and Dataset objects
+        Dictionary containing Sample, Experiment, Instrument, and Dataset objects,
+        the raw data, its pre-parsed shared fields and the ISO timestamp they
+        were stamped with
     """
-    massive_data = fetch_massive_data(massive_id)
+    if massive_data is None:
+        massive_data = fetch_massive_data(massive_id)
+    common = extract_common(massive_data)
+    now_iso = datetime.now().isoformat()
     
-    samples = create_samples(massive_data, massive_id)
+    samples = create_samples(massive_data, massive_id, common)
     instruments = create_instruments(massive_data, massive_id)
-    experiments = create_experiments(massive_data, samples, instruments, massive_id)
+    experiments = create_experiments(massive_data, samples, instruments, massive_id, common, now_iso)
     
-    datasets = create_datasets(massive_data, experiments, massive_id)
+    datasets = create_datasets(massive_data, experiments, massive_id, common, now_iso)
     
     update_experiments_with_datasets(experiments, datasets)
     
@@ -33,19 +104,33 @@ def from_massive(massive_id: str) -> Dict[str, Any]:
         "instruments": instruments,
         "experiments": experiments,
         "datasets": datasets,
-        "raw_data": massive_data
+        "raw_data": massive_data,
+        "common": common,
+        "timestamp": now_iso
     }
 
-def fetch_massive_data(massive_id: str, timeout: float = 30.0) -> Dict[str, Any]:
+def fetch_massive_data(
+    massive_id: str,
+    timeout: float = 30.0,
+    use_cache: bool = True,
+    ttl: float = MASSIVE_CACHE_TTL
+) -> Dict[str, Any]:
     """
     Fetch data for a MassIVE dataset.
     
+    Responses are cached as {massive_id}.json under MASSIVE_CACHE_DIR and reused
+    while they are younger than ttl seconds.
+    
     Parameters
     ----------
     massive_id : str
         MassIVE identifier
     timeout : float
         Request timeout in seconds
+    use_cache : bool
+        Whether to read and write the on-disk cache
+    ttl : float
+        Maximum age in seconds of a cached response
         
     Returns
     -------
@@ -55,16 +140,225 @@ def fetch_massive_data(massive_id: str, timeout: float = 30.0) -> Dict[str, Any]
 
     massive_id = str(massive_id).upper()
     
+    cache_file = MASSIVE_CACHE_DIR / f"{massive_id}.json"
+    if use_cache and cache_file.exists() and time.time() - cache_file.stat().st_mtime < ttl:
+        try:
+            return _loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass
+    
     api_url = f"https://massive.ucsd.edu/ProteoSAFe/proxi/v0.1/datasets/{massive_id}"
     
-    response = requests.get(api_url, timeout=timeout)
+    # Read the body straight off the socket, skipping the copy requests keeps in
+    # response.content; the same bytes are parsed and written to the cache
+    with _session.get(api_url, timeout=timeout, stream=True) as response:
+        if response.status_code != 200:
+            raise ValueError(f"Failed to fetch MassIVE data: HTTP {response.status_code}")
+        body = response.raw.read(decode_content=True)
+    
+    massive_data = _loads(body)
+    
+    if use_cache:
+        # Write to a temporary file in the cache directory and move it into place, so
+        # concurrent fetches of the same id never leave a truncated entry behind. A
+        # cache that cannot be written only skips caching
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix=f".{massive_id}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(body)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+    
+    return massive_data
+
+def fetch_massive_data_many(
+    massive_ids: Iterable[str],
+    timeout: float = 30.0,
+    max_workers: int = 10,
+    use_cache: bool = True,
+    ttl: float = MASSIVE_CACHE_TTL
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Fetch data for several MassIVE datasets concurrently.
+    
+    A dataset that fails to fetch is reported on stderr and yields None, so one
+    bad identifier does not discard the rest of the batch.
+    
+    Parameters
+    ----------
+    massive_ids : Iterable[str]
+        MassIVE identifiers
+    timeout : float
+        Request timeout in seconds, per dataset
+    max_workers : int
+        Maximum number of requests in flight at once
+    use_cache : bool
+        Whether to read and write the on-disk cache
+    ttl : float
+        Maximum age in seconds of a cached response
+        
+    Returns
+    -------
+    List[Optional[Dict[str, Any]]]
+        Raw MassIVE data, or None where the fetch failed, in the same order as massive_ids
+    """
+    def fetch(massive_id):
+        try:
+            return fetch_massive_data(massive_id, timeout, use_cache, ttl)
+        except Exception as e:
+            print(f"Error fetching MassIVE dataset {massive_id}: {e}", file=sys.stderr)
+            return None
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(fetch, massive_ids))
+
+def collect_keywords(
+    massive_data: Dict[str, Any],
+    defaults: Iterable[str],
+    split_phrases: bool = True
+) -> List[str]:
+    """
+    Collect the distinct keywords of a MassIVE dataset, in first-seen order.
+    
+    Parameters
+    ----------
+    massive_data : Dict[str, Any]
+        Raw MassIVE data
+    defaults : Iterable[str]
+        Keywords placed ahead of the dataset's own
+    split_phrases : bool
+        Whether keywords longer than 15 characters containing spaces are split into words
+        
+    Returns
+    -------
+    List[str]
+        Keyword list without duplicates
+    """
+    keywords = list(defaults)
+    seen = set(keywords)
+    for keyword_item in massive_data.get("keywords", []):
+        kw_value = keyword_item.get("value")
+        if not kw_value or kw_value in seen:
+            continue
+        if split_phrases and " " in kw_value and len(kw_value) > 15:
+            parts = kw_value.split()
+        else:
+            parts = (kw_value,)
+        for part in parts:
+            if part not in seen:
+                seen.add(part)
+                keywords.append(part)
+    return keywords
+
+@dataclass(slots=True)
+class _MassiveCommon:
+    """
+    Dataset-level fields shared by the sample, experiment, dataset and crate builders.
+    """
+    author: str = "Unknown"
+    keywords: List[str] = field(default_factory=list)
+    publication: Optional[str] = None
+    dataset_uri: Optional[str] = None
+    ftp_location: Optional[str] = None
+    summary: Optional[str] = None
+
+def _first_contact_name(massive_data: Dict[str, Any]) -> str:
+    """
+    Return the first non-empty contact name of a MassIVE dataset, or "Unknown".
+    """
+    for contact_group in massive_data.get("contacts", ()):
+        for item in contact_group:
+            if item.get("name") == "contact name" and item.get("value"):
+                return item["value"]
+    return "Unknown"
+
+def extract_common(massive_data: Dict[str, Any]) -> _MassiveCommon:
+    """
+    Read the contacts, keywords, publications and dataset links of a MassIVE
+    dataset in a single pass over each list.
+    
+    Parameters
+    ----------
+    massive_data : Dict[str, Any]
+        Raw MassIVE data
+        
+    Returns
+    -------
+    _MassiveCommon
+        Fields shared by the builders
+    """
+    common = _MassiveCommon(
+        author=_first_contact_name(massive_data),
+        keywords=collect_keywords(massive_data, ("proteomics", "mass spectrometry"))
+    )
+    
+    # Entity descriptions quote summaries over 100 characters cut to 150
+    summary = massive_data.get("summary")
+    if summary:
+        common.summary = f"{summary[:150]}..." if len(summary) > 100 else summary
+    
+    for pub in massive_data.get("publications", []):
+        if pub.get("name") != "Dataset with no associated published manuscript":
+            common.publication = pub.get("value", "")
+    
+    links = {}
+    for link in massive_data.get("datasetLink", []):
+        link_field = _LINK_FIELDS.get(link.get("accession"))
+        if link_field is not None and "value" in link:
+            links.setdefault(link_field, link["value"])
+    common.dataset_uri = links.get("dataset_uri")
+    common.ftp_location = links.get("ftp_location")
     
-    if response.status_code != 200:
-        raise ValueError(f"Failed to fetch MassIVE data: HTTP {response.status_code}")
+    return common
+
+def _build_sample(
+    sample_id: str,
+    species_group: List[Dict[str, Any]],
+    massive_id: str,
+    title: Optional[str],
+    common: _MassiveCommon
+) -> Dict[str, Any]:
+    """
+    Build the sample for one species group of a MassIVE dataset.
+    """
+    fields = {"species_name": "Unknown", "taxon_id": ""}
+    for species in species_group:
+        species_field = _SPECIES_FIELDS.get(species.get("accession"))
+        if species_field is not None and "value" in species:
+            fields[species_field] = species["value"]
+    species_name = fields["species_name"]
+    
+    if common.summary:
+        description = f"Sample of {species_name} used in experiments described as: {common.summary}"
+    else:
+        description = f"Sample of {species_name} used in mass spectrometry experiment."
     
-    return response.json()
+    return {
+        "@id": sample_id,
+        "name": f"{species_name} sample from {title}" if title else f"Sample from {species_name}",
+        "metadataType": "https://w3id.org/EVI#Sample",
+        "author": common.author,
+        "description": description,
+        "keywords": common.keywords,
+        "contentUrl": common.dataset_uri,
+        "additionalProperty": [
+            {**_PROP_TAXON_ID, "value": fields["taxon_id"]},
+            {**_PROP_SCIENTIFIC_NAME, "value": species_name},
+            {**_PROP_DATASET_ID, "value": massive_id}
+        ]
+    }
 
-def create_samples(massive_data: Dict[str, Any], massive_id: str) -> List[Dict[str, Any]]:
+def create_samples(
+    massive_data: Dict[str, Any],
+    massive_id: str,
+    common: Optional[_MassiveCommon] = None
+) -> List[Dict[str, Any]]:
     """
     Create sample objects from MassIVE data.
     
@@ -74,128 +368,43 @@ def create_samples(massive_data: Dict[str, Any], massive_id: str) -> List[Dict[s
         Raw MassIVE data
     massive_id : str
         MassIVE identifier
+    common : _MassiveCommon, optional
+        Shared fields from extract_common, computed here when omitted
         
     Returns
     -------
     List[Dict[str, Any]]
         List of sample objects compatible with the Sample model
     """
-    samples = []
-    
-    contacts = []
-    for contact_group in massive_data.get("contacts", []):
-        contact_info = {}
-        for item in contact_group:
-            if item.get("name") == "contact name" and "value" in item:
-                contact_info["name"] = item["value"]
-            elif item.get("name") == "contact affiliation" and "value" in item:
-                contact_info["affiliation"] = item["value"]
-        
-        if contact_info.get("name"):
-            contacts.append(contact_info.get("name"))
+    if common is None:
+        common = extract_common(massive_data)
     
-    author = contacts[0] if contacts else "Unknown"
+    sample_id_prefix = f"ark:59852/sample-{massive_id.lower()}-"
+    title = massive_data.get("title")
     
-    keywords = ["proteomics", "mass spectrometry"]
-    for keyword_item in massive_data.get("keywords", []):
-        if "value" in keyword_item:
-            kw_value = keyword_item["value"]
-            if kw_value and kw_value not in keywords:
-                if " " in kw_value and len(kw_value) > 15:
-                    keywords.extend(kw_value.split())
-                else:
-                    keywords.append(kw_value)
-    
-    for i, species_group in enumerate(massive_data.get("species", []), 1):
-        species_name = "Unknown"
-        taxon_id = ""
-        
-        for species in species_group:
-            if species.get("accession") == "MS:1001469" and "value" in species:
-                species_name = species["value"]
-            if species.get("accession") == "MS:1001467" and "value" in species:
-                taxon_id = species["value"]
-        
-        sample_name = f"Sample from {species_name}"
-        if massive_data.get("title"):
-            sample_name = f"{species_name} sample from {massive_data.get('title')}"
-        
-        sample_id = f"ark:59852/sample-{massive_id.lower()}-{i}"
-        
-        description = f"Sample of {species_name} used in mass spectrometry experiment."
-        if massive_data.get("summary"):
-            summary = massive_data.get("summary")
-            if len(summary) > 100:
-                description = f"Sample of {species_name} used in experiments described as: {summary[:150]}..."
-            else:
-                description = f"Sample of {species_name} used in experiments described as: {summary}"
-        
-        content_url = None
-        for link in massive_data.get("datasetLink", []):
-            if link.get("accession") == "MS:1002488" and "value" in link: 
-                content_url = link["value"]
-                break
-        
-        sample = {
-            "@id": sample_id,
-            "name": sample_name,
-            "metadataType": "https://w3id.org/EVI#Sample",
-            "author": author,
-            "description": description,
-            "keywords": keywords,
-            "contentUrl": content_url,
-            "additionalProperty": [
-                {
-                    "@type": "PropertyValue",
-                    "propertyID": "taxon_id",
-                    "value": taxon_id
-                },
-                {
-                    "@type": "PropertyValue",
-                    "propertyID": "scientific_name",
-                    "value": species_name
-                },
-                {
-                    "@type": "PropertyValue",
-                    "propertyID": "dataset_id",
-                    "value": massive_id
-                }
-            ]
-        }
-        
-        samples.append(sample)
+    samples = [
+        _build_sample(f"{sample_id_prefix}{i}", species_group, massive_id, title, common)
+        for i, species_group in enumerate(massive_data.get("species", []), 1)
+    ]
     
     if not samples:
-        sample_id = f"ark:59852/sample-{massive_id.lower()}-1"
+        sample_id = f"{sample_id_prefix}1"
         
-        description = "Sample used in mass spectrometry experiment."
-        if massive_data.get("summary"):
-            summary = massive_data.get("summary")
-            if len(summary) > 100:
-                description = f"Sample used in experiment described as: {summary[:150]}..."
-            else:
-                description = f"Sample used in experiment described as: {summary}"
-        
-        content_url = None
-        for link in massive_data.get("datasetLink", []):
-            if link.get("accession") == "MS:1002488" and "value" in link:
-                content_url = link["value"]
-                break
+        if common.summary:
+            description = f"Sample used in experiment described as: {common.summary}"
+        else:
+            description = "Sample used in mass spectrometry experiment."
         
         sample = {
             "@id": sample_id,
             "name": f"Sample from {massive_data.get('title', 'MassIVE experiment')}",
             "metadataType": "https://w3id.org/EVI#Sample",
-            "author": author,
+            "author": common.author,
             "description": description,
-            "keywords": keywords,
-            "contentUrl": content_url,
+            "keywords": common.keywords,
+            "contentUrl": common.dataset_uri,
             "additionalProperty": [
-                {
-                    "@type": "PropertyValue",
-                    "propertyID": "dataset_id",
-                    "value": massive_id
-                }
+                {**_PROP_DATASET_ID, "value": massive_id}
             ]
         }
         
@@ -203,6 +412,25 @@ def create_samples(massive_data: Dict[str, Any], massive_id: str) -> List[Dict[s
     
     return samples
 
+def _build_instrument(instrument_id: str, instrument_info: Dict[str, Any], massive_id: str) -> Dict[str, Any]:
+    """
+    Build one instrument of a MassIVE dataset.
+    """
+    instrument_name = instrument_info.get("name", "Unknown instrument")
+    return {
+        "@id": instrument_id,
+        "name": instrument_name,
+        "metadataType": "https://w3id.org/EVI#Instrument",
+        "manufacturer": "",
+        "model": instrument_name,
+        "description": f"{instrument_name} mass spectrometer used for proteomics analysis in MassIVE dataset {massive_id}.",
+        "usedByExperiment": [],
+        "additionalProperty": [
+            {**_PROP_ACCESSION, "value": instrument_info.get("accession", "")},
+            {**_PROP_CV_LABEL, "value": instrument_info.get("cvLabel", "")}
+        ]
+    }
+
 def create_instruments(massive_data: Dict[str, Any], massive_id: str) -> List[Dict[str, Any]]:
     """
     Create instrument objects from MassIVE data.
@@ -219,44 +447,19 @@ def create_instruments(massive_data: Dict[str, Any], massive_id: str) -> List[Di
     List[Dict[str, Any]]
         List of instrument objects compatible with the Instrument model
     """
-    instruments = []
-    
-    for i, instrument_info in enumerate(massive_data.get("instruments", []), 1):
-        instrument_name = instrument_info.get("name", "Unknown instrument")
-        
-        instrument_id = f"ark:59852/instrument-{massive_id.lower()}-{i}"
-        
-        instrument = {
-            "@id": instrument_id,
-            "name": instrument_name,
-            "metadataType": "https://w3id.org/EVI#Instrument",
-            "manufacturer": "",
-            "model": instrument_name,
-            "description": f"{instrument_name} mass spectrometer used for proteomics analysis in MassIVE dataset {massive_id}.",
-            "usedByExperiment": [],
-            "additionalProperty": [
-                {
-                    "@type": "PropertyValue",
-                    "propertyID": "accession",
-                    "value": instrument_info.get("accession", "")
-                },
-                {
-                    "@type": "PropertyValue",
-                    "propertyID": "cvLabel",
-                    "value": instrument_info.get("cvLabel", "")
-                }
-            ]
-        }
-        
-        instruments.append(instrument)
-    
-    return instruments
+    instrument_id_prefix = f"ark:59852/instrument-{massive_id.lower()}-"
+    return [
+        _build_instrument(f"{instrument_id_prefix}{i}", instrument_info, massive_id)
+        for i, instrument_info in enumerate(massive_data.get("instruments", []), 1)
+    ]
 
 def create_experiments(
     massive_data: Dict[str, Any], 
     samples: List[Dict[str, Any]], 
     instruments: List[Dict[str, Any]],
-    massive_id: str
+    massive_id: str,
+    common: Optional[_MassiveCommon] = None,
+    now_iso: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Create experiment objects from MassIVE data.
@@ -271,51 +474,45 @@ def create_experiments(
         List of instrument objects
     massive_id : str
         MassIVE identifier
+    common : _MassiveCommon, optional
+        Shared fields from extract_common, computed here when omitted
+    now_iso : str, optional
+        ISO timestamp used as datePerformed, the current time when omitted
         
     Returns
     -------
     List[Dict[str, Any]]
         List of experiment objects compatible with the Experiment model
     """
-    experiments = []
+    if common is None:
+        common = extract_common(massive_data)
     
-    publication = None
-    for pub in massive_data.get("publications", []):
-        if pub.get("name") != "Dataset with no associated published manuscript":
-            publication = pub.get("value", "")
-    
-    run_by = "Unknown"
-    for contact_group in massive_data.get("contacts", []):
-        for item in contact_group:
-            if item.get("name") == "contact name" and "value" in item:
-                run_by = item["value"]
-                break
+    experiments = []
+    experiment_id_prefix = f"ark:59852/experiment-{massive_id.lower()}-"
+    title = massive_data.get("title")
+    publication = common.publication
+    run_by = common.author
+    summary = common.summary
     
-    date_performed = datetime.now().isoformat()
+    date_performed = now_iso or datetime.now().isoformat()
     experiment_types = ["Proteomics"]
     
     sample_refs = [{"@id": sample["@id"]} for sample in samples]
     instrument_refs = [{"@id": instrument["@id"]} for instrument in instruments]
     
-    for instrument in instruments:
-        instrument["usedByExperiment"] = []
-    
     for i, exp_type in enumerate(experiment_types, 1):
 
-        experiment_id = f"ark:59852/experiment-{massive_id.lower()}-{i}"
+        experiment_id = f"{experiment_id_prefix}{i}"
         
-        if massive_data.get("title"):
-            experiment_name = f"{exp_type} experiment: {massive_data.get('title')}"
+        if title:
+            experiment_name = f"{exp_type} experiment: {title}"
         else:
             experiment_name = f"{exp_type} experiment from MassIVE dataset {massive_id}"
         
-        description = f"{exp_type} mass spectrometry experiment from MassIVE dataset {massive_id}."
-        if massive_data.get("summary"):
-            summary = massive_data.get("summary")
-            if len(summary) > 100:
-                description = f"{exp_type} experiment described as: {summary[:150]}..."
-            else:
-                description = f"{exp_type} experiment described as: {summary}"
+        if summary:
+            description = f"{exp_type} experiment described as: {summary}"
+        else:
+            description = f"{exp_type} mass spectrometry experiment from MassIVE dataset {massive_id}."
         
         experiment = {
             "@id": experiment_id,
@@ -330,27 +527,66 @@ def create_experiments(
             "usedSample": sample_refs,
             "generated": [], 
             "additionalProperty": [
-                {
-                    "@type": "PropertyValue",
-                    "propertyID": "dataset_id",
-                    "value": massive_id
-                },
-                {
-                    "@type": "PropertyValue",
-                    "propertyID": "dataset_url",
-                    "value": f"https://massive.ucsd.edu/ProteoSAFe/QueryMSV?id={massive_id}"
-                }
+                {**_PROP_DATASET_ID, "value": massive_id},
+                {**_PROP_DATASET_URL, "value": f"https://massive.ucsd.edu/ProteoSAFe/QueryMSV?id={massive_id}"}
             ]
         }
         
         experiments.append(experiment)
-        
-        for instrument in instruments:
-            instrument["usedByExperiment"].append({"@id": experiment_id})
+    
+    # Every instrument is used by every experiment, so they share one reference
+    # list, as the experiments already share sample_refs and instrument_refs
+    experiment_refs = [{"@id": experiment["@id"]} for experiment in experiments]
+    for instrument in instruments:
+        instrument["usedByExperiment"] = experiment_refs
     
     return experiments
 
-def create_datasets(massive_data: Dict[str, Any], experiments: List[Dict[str, Any]], massive_id: str) -> List[Dict[str, Any]]:
+def _build_dataset(
+    dataset_id: str,
+    dataset_type: str,
+    file_format: str,
+    experiment: Dict[str, Any],
+    massive_id: str,
+    common: _MassiveCommon,
+    date_published: str
+) -> Dict[str, Any]:
+    """
+    Build one dataset of the given type generated by an experiment.
+    """
+    experiment_name = experiment["name"]
+    
+    if common.summary:
+        description = f"{dataset_type} from experiment described as: {common.summary}"
+    else:
+        description = f"{dataset_type} generated from {experiment_name} in MassIVE dataset {massive_id}."
+    
+    return {
+        "@id": dataset_id,
+        "name": f"{dataset_type} from {experiment_name}",
+        "@type": "https://w3id.org/EVI#Dataset",
+        "author": common.author,
+        "datePublished": date_published,
+        "version": "1.0",
+        "description": description,
+        "keywords": common.keywords,
+        "associatedPublication": common.publication,
+        "format": file_format,
+        "contentUrl": common.ftp_location or common.dataset_uri,
+        "generatedBy": [{"@id": experiment["@id"]}],
+        "additionalProperty": [
+            {**_PROP_DATASET_ID, "value": massive_id},
+            {**_PROP_DATASET_TYPE, "value": dataset_type}
+        ]
+    }
+
+def create_datasets(
+    massive_data: Dict[str, Any],
+    experiments: List[Dict[str, Any]],
+    massive_id: str,
+    common: Optional[_MassiveCommon] = None,
+    now_iso: Optional[str] = None
+) -> List[Dict[str, Any]]:
     """
     Create dataset objects from MassIVE data.
     
@@ -362,49 +598,21 @@ def create_datasets(massive_data: Dict[str, Any], experiments: List[Dict[str, An
         List of experiment objects
     massive_id : str
         MassIVE identifier
+    common : _MassiveCommon, optional
+        Shared fields from extract_common, computed here when omitted
+    now_iso : str, optional
+        ISO timestamp used as datePublished, the current time when omitted
         
     Returns
     -------
     List[Dict[str, Any]]
         List of dataset objects compatible with the Dataset model
     """
-    datasets = []
+    if common is None:
+        common = extract_common(massive_data)
     
-    author = "Unknown"
-    for contact_group in massive_data.get("contacts", []):
-        for item in contact_group:
-            if item.get("name") == "contact name" and "value" in item:
-                author = item["value"]
-                break
-    
-    keywords = ["proteomics", "mass spectrometry"]
-    for keyword_item in massive_data.get("keywords", []):
-        if "value" in keyword_item:
-            kw_value = keyword_item["value"]
-            if kw_value and kw_value not in keywords:
-                if " " in kw_value and len(kw_value) > 15:
-                    keywords.extend(kw_value.split())
-                else:
-                    keywords.append(kw_value)
-    
-    publication = None
-    for pub in massive_data.get("publications", []):
-        if pub.get("name") != "Dataset with no associated published manuscript":
-            publication = pub.get("value", "")
-    
-    date_published = datetime.now().isoformat()
-    
-    content_url = None
-    for link in massive_data.get("datasetLink", []):
-        if link.get("accession") == "MS:1002852" and "value" in link:  # Dataset FTP location
-            content_url = link["value"]
-            break
-    
-    if not content_url:
-        for link in massive_data.get("datasetLink", []):
-            if link.get("accession") == "MS:1002488" and "value" in link:  # MassIVE dataset URI
-                content_url = link["value"]
-                break
+    dataset_id_root = f"ark:59852/dataset-{massive_id.lower()}-"
+    date_published = now_iso or datetime.now().isoformat()
     
     dataset_types = []
     
@@ -418,68 +626,21 @@ def create_datasets(massive_data: Dict[str, Any], experiments: List[Dict[str, An
         if default_type not in dataset_types:
             dataset_types.append(default_type)
     
-    for experiment in experiments:
-        experiment_id = experiment["@id"]
-        experiment_name = experiment["name"]
-        experiment_type = experiment["experimentType"]
-
-        
-        for i, dataset_type in enumerate(dataset_types, 1):
-
-            dataset_id = f"ark:59852/dataset-{massive_id.lower()}-{experiment_type.lower().replace(' ', '-')}-{i}"
-            
-            dataset_name = f"{dataset_type} from {experiment_name}"
-            
-            description = f"{dataset_type} generated from {experiment_name} in MassIVE dataset {massive_id}."
-            if massive_data.get("summary"):
-                summary = massive_data.get("summary")
-                if len(summary) > 100:
-                    description = f"{dataset_type} from experiment described as: {summary[:150]}..."
-                else:
-                    description = f"{dataset_type} from experiment described as: {summary}"
-            
-            file_format = "raw"
-            if "Raw" in dataset_type:
-                file_format = "raw"
-            elif "Processed" in dataset_type:
-                file_format = "mzIdentML"
-            elif "Protein" in dataset_type:
-                file_format = "fasta"
-            elif "Peptide" in dataset_type:
-                file_format = "mgf"
-            elif "Spectra" in dataset_type:
-                file_format = "mzML"
-            
-            dataset = {
-                "@id": dataset_id,
-                "name": dataset_name,
-                "@type": "https://w3id.org/EVI#Dataset",
-                "author": author,
-                "datePublished": date_published,
-                "version": "1.0",
-                "description": description,
-                "keywords": keywords,
-                "associatedPublication": publication,
-                "format": file_format,
-                "contentUrl": content_url,
-                "generatedBy": [{"@id": experiment_id}],
-                "additionalProperty": [
-                    {
-                        "@type": "PropertyValue",
-                        "propertyID": "dataset_id",
-                        "value": massive_id
-                    },
-                    {
-                        "@type": "PropertyValue",
-                        "propertyID": "dataset_type",
-                        "value": dataset_type
-                    }
-                ]
-            }
-            
-            datasets.append(dataset)
-    
-    return datasets
+    fmt_by_type = {
+        dataset_type: next((fmt for marker, fmt in _DATASET_FORMATS if marker in dataset_type), "raw")
+        for dataset_type in dataset_types
+    }
+    
+    dataset_id_prefixes = [
+        f"{dataset_id_root}{experiment['experimentType'].lower().replace(' ', '-')}-"
+        for experiment in experiments
+    ]
+    
+    return [
+        _build_dataset(f"{dataset_id_prefix}{i}", dataset_type, fmt_by_type[dataset_type], experiment, massive_id, common, date_published)
+        for experiment, dataset_id_prefix in zip(experiments, dataset_id_prefixes)
+        for i, dataset_type in enumerate(dataset_types, 1)
+    ]
 
 def update_experiments_with_datasets(experiments: List[Dict[str, Any]], datasets: List[Dict[str, Any]]) -> None:
     """
@@ -492,22 +653,25 @@ def update_experiments_with_datasets(experiments: List[Dict[str, Any]], datasets
     datasets : List[Dict[str, Any]]
         List of dataset objects
     """
-    experiment_to_datasets = {}
+    experiment_to_dataset_ids = defaultdict(list)
     for dataset in datasets:
-        generated_by = dataset.get("generatedBy", [])
-        for generator in generated_by:
+        for generator in dataset.get("generatedBy", ()):
             experiment_id = generator.get("@id")
             if experiment_id:
-                if experiment_id not in experiment_to_datasets:
-                    experiment_to_datasets[experiment_id] = []
-                experiment_to_datasets[experiment_id].append(dataset)
+                experiment_to_dataset_ids[experiment_id].append(dataset["@id"])
     
     for experiment in experiments:
-        experiment_id = experiment["@id"]
-        if experiment_id in experiment_to_datasets:
-            experiment["generated"] = [{"@id": dataset["@id"]} for dataset in experiment_to_datasets[experiment_id]]
+        dataset_ids = experiment_to_dataset_ids.get(experiment["@id"])
+        if dataset_ids:
+            experiment["generated"] = [{"@id": dataset_id} for dataset_id in dataset_ids]
+
+@lru_cache(maxsize=None)
+def _list_adapter(model):
+    # Built once per model class; validating a whole list in one call stays inside pydantic-core
+    from pydantic import TypeAdapter
+    return TypeAdapter(List[model])
 
-def create_rocrate_from_massive(massive_id, output_path, author="Unknown"):
+def create_rocrate_from_massive(massive_id, output_path, author="Unknown", massive_data=None):
     """
     Create an RO-Crate from a MassIVE dataset
     
@@ -519,6 +683,8 @@ def create_rocrate_from_massive(massive_id, output_path, author="Unknown"):
         Output path for the RO-Crate
     author : str, optional
         Author name for the RO-Crate
+    massive_data : Dict[str, Any], optional
+        Already fetched raw MassIVE data, fetched here when omitted
         
     Returns
     -------
@@ -526,7 +692,7 @@ def create_rocrate_from_massive(massive_id, output_path, author="Unknown"):
         Path to the created RO-Crate
     """
 
-    results = from_massive(massive_id)
+    results = from_massive(massive_id, massive_data)
     
     raw_data = results["raw_data"]
     
@@ -535,29 +701,17 @@ def create_rocrate_from_massive(massive_id, output_path, author="Unknown"):
     
     crate_name = raw_data.get("title", f"MassIVE Dataset {massive_id}")
     crate_description = raw_data.get("summary", f"Proteomics data from MassIVE dataset {massive_id}")
-    keywords = ["proteomics", "mass spectrometry", "MassIVE"]
-    for keyword_item in raw_data.get("keywords", []):
-        if "value" in keyword_item:
-            kw_value = keyword_item["value"]
-            if kw_value and kw_value not in keywords:
-                keywords.append(kw_value)
-    
-    publication = ""
-    for pub in raw_data.get("publications", []):
-        if pub.get("name") != "Dataset with no associated published manuscript":
-            publication = pub.get("value", "")
+    keywords = collect_keywords(raw_data, ("proteomics", "mass spectrometry", "MassIVE"), split_phrases=False)
     
-    dataset_url = ""
-    for link in raw_data.get("datasetLink", []):
-        if link.get("accession") == "MS:1002488":  # MassIVE dataset URI
-            dataset_url = link.get("value", "")
+    common = results["common"]
+    publication = common.publication or ""
+    dataset_url = common.dataset_uri or ""
     
     try:
-        from fairscape_cli.models.rocrate import GenerateROCrate, AppendCrate
+        from fairscape_cli.models.rocrate import GenerateROCrate
         from fairscape_models.experiment import Experiment
         from fairscape_models.sample import Sample
         from fairscape_models.instrument import Instrument
-        from pathlib import Path
         
         rocrate_data = GenerateROCrate(
             path=output_path,
@@ -568,26 +722,75 @@ def create_rocrate_from_massive(massive_id, output_path, author="Unknown"):
             license="https://creativecommons.org/publicdomain/zero/1.0/",
             hasPart=[],
             author=author,
-            datePublished=datetime.now().isoformat(),
+            datePublished=results["timestamp"],
             associatedPublication=publication,
             isPartOf=[],
             version="1.0",
             sameAs=dataset_url
         )
         
-        samples = [Sample.model_validate(s) for s in results["samples"]]
-        instruments = [Instrument.model_validate(i) for i in results["instruments"]]
-        experiments = [Experiment.model_validate(e) for e in results["experiments"]]
-        
-        AppendCrate(output_path, samples)
+        samples = _list_adapter(Sample).validate_python(results["samples"])
+        instruments = _list_adapter(Instrument).validate_python(results["instruments"])
+        experiments = _list_adapter(Experiment).validate_python(results["experiments"])
         
-        AppendCrate(output_path, instruments)
-        
-        AppendCrate(output_path, experiments)
+        with CrateWriter(output_path) as crate:
+            crate.extend(samples)
+            crate.extend(instruments)
+            crate.extend(experiments)
         
         return str(output_path / "ro-crate-metadata.json")
     
     except ImportError as e:
         print(f"Error: {e}")
         print("Make sure fairscape_cli and fairscape_models are installed")
-        return None
\ No newline at end of file
+        return None
+
+def create_rocrates_from_massive_many(
+    massive_ids: Iterable[str],
+    output_root,
+    author: str = "Unknown",
+    max_workers: Optional[int] = None
+) -> List[Optional[str]]:
+    """
+    Create one RO-Crate per MassIVE dataset under output_root/<massive_id>.
+    
+    The datasets are fetched concurrently over the shared session, then the
+    crates are built and validated in a process pool, one dataset per task. A
+    dataset that fails is reported on stderr without stopping the others.
+    
+    Parameters
+    ----------
+    massive_ids : Iterable[str]
+        MassIVE identifiers
+    output_root : str
+        Directory that receives one crate directory per dataset
+    author : str, optional
+        Author name for the RO-Crates
+    max_workers : int, optional
+        Maximum number of worker processes, one per CPU when omitted
+        
+    Returns
+    -------
+    List[Optional[str]]
+        Paths to the created RO-Crate metadata files, or None for datasets that
+        could not be fetched or built, in the same order as massive_ids
+    """
+    massive_ids = [str(massive_id).upper() for massive_id in massive_ids]
+    output_paths = [str(Path(output_root) / massive_id) for massive_id in massive_ids]
+    massive_data = fetch_massive_data_many(massive_ids)
+    
+    results = [None] * len(massive_ids)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # Datasets whose fetch failed were already reported and are skipped
+        futures = {
+            pool.submit(create_rocrate_from_massive, massive_id, output_path, author, data): i
+            for i, (massive_id, output_path, data) in enumerate(zip(massive_ids, output_paths, massive_data))
+            if data is not None
+        }
+        for future, i in futures.items():
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                print(f"Error creating RO-Crate for MassIVE dataset {massive_ids[i]}: {e}", file=sys.stderr)
+    
+    return results